@@ -1,8 +1,14 @@
 import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+from functools import lru_cache
+import orjson
 from pathlib import Path
 import sys
-from typing import Optional
-import time
+from typing import Optional, Iterator, List, Tuple
 from datetime import datetime
 
 # Add src directory to Python path
@@ -11,9 +17,16 @@ sys.path.append(str(src_path))
 
 from src.bot import TradingBot
 from src.capture.click_recorder import ClickRecorder, get_category_for_item
-from src.utils.market_gemini import analyze_latest_market
 from src.trade.strategies import TradingStrategies
 
+# Per-pair scan progress, formatted lazily so quiet runs skip the work
+logger = logging.getLogger("scan")
+
+@lru_cache(maxsize=1)
+def get_bot() -> TradingBot:
+    """Shared TradingBot, so recorder sequences and strategy history load once per process"""
+    return TradingBot()
+
 def setup_argparse() -> argparse.ArgumentParser:
     """Setup command line argument parser"""
     parser = argparse.ArgumentParser(description='POE2 Currency Trading Bot')
@@ -45,6 +58,15 @@ def setup_argparse() -> argparse.ArgumentParser:
                        help='Specific category to scan (for scan mode)')
     parser.add_argument('--trade-list', type=str,
                        help='Path to file containing list of items to scan for trading opportunities')
+    parser.add_argument('--log-level', type=str, default='INFO',
+                       choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                       help='Verbosity of scan progress and per-click playback (DEBUG shows every click, WARNING keeps long scans quiet)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                       help='Maximum number of market scans in flight (for scan and bot modes)')
+    parser.add_argument('--max-cycle-length', type=int,
+                       help='Enumerate arbitrage cycles of up to this many legs (default: Bellman-Ford negative cycle search)')
+    parser.add_argument('--shortest-cycles', action='store_true',
+                       help='Only report the profitable arbitrage cycles with the fewest legs, searching up to --max-cycle-length legs (default: 4)')
     
     return parser
 
@@ -66,8 +88,59 @@ def record_sequence(sequence_name: str):
         print(f"Error recording sequence: {e}")
         sys.exit(1)
 
-def analyze_market():
+def format_basic_opportunity(index: int, named_opp: Tuple[str, object]) -> str:
+    """Report block for a (strategy name, TradingOpportunity) entry"""
+    strategy_name, opp = named_opp
+    return (
+        f"\n{strategy_name}:\n"
+        f"Buy {opp.buy_currency} at {opp.buy_ratio}\n"
+        f"Sell {opp.sell_currency} at {opp.sell_ratio}\n"
+        f"Potential Profit: {opp.potential_profit*100:.2f}%\n"
+        f"Recommended Volume: {opp.trade_volume}\n"
+        f"Confidence: {opp.confidence*100:.2f}%"
+    )
+
+def format_cycle_opportunity(index: int, opp) -> str:
+    """Report block for a CycleOpportunity"""
+    steps = "".join(
+        f"Step {step_num}: Trade {from_currency} -> {to_currency} at {ratio}\n"
+        for step_num, (from_currency, to_currency, ratio) in enumerate(opp.steps, 1)
+    )
+    return (
+        f"\nOpportunity {index}:\n{steps}"
+        f"Total Profit: {opp.total_profit*100:.2f}%\n"
+        f"Safe Volume: {opp.min_volume}\n"
+        f"Confidence: {opp.confidence*100:.2f}%"
+    )
+
+def format_market_making_opportunity(index: int, opp) -> str:
+    """Report block for a MarketMakingOpportunity"""
+    return (
+        f"\nOpportunity {index}:\n"
+        f"Currency Pair: {opp.currency_pair[0]}/{opp.currency_pair[1]}\n"
+        f"Bid: {opp.bid_price}, Ask: {opp.ask_price}\n"
+        f"Spread: {opp.spread*100:.2f}%\n"
+        f"Volume: {opp.volume}\n"
+        f"Volatility: {opp.volatility*100:.2f}%\n"
+        f"Confidence: {opp.confidence*100:.2f}%"
+    )
+
+# (opportunities key, section title, block formatter) in report order
+OPPORTUNITY_SECTIONS = (
+    ('basic', "Basic Trading Opportunities", format_basic_opportunity),
+    ('cycle', "Cycle Arbitrage Opportunities", format_cycle_opportunity),
+    ('market_making', "Market Making Opportunities", format_market_making_opportunity),
+)
+
+def configure_strategies(strategies: TradingStrategies, args: argparse.Namespace) -> TradingStrategies:
+    """Apply the cycle search options from the command line"""
+    strategies.max_cycle_length = args.max_cycle_length
+    strategies.shortest_cycles_only = args.shortest_cycles
+    return strategies
+
+def analyze_market(args: argparse.Namespace):
     """Analyze latest market data"""
+    from src.utils.market_gemini import analyze_latest_market
     try:
         print("\nAnalyzing latest market data...")
         market_data = analyze_latest_market()
@@ -77,7 +150,7 @@ def analyze_market():
             return
             
         # Initialize strategies and analyze
-        strategies = TradingStrategies()
+        strategies = configure_strategies(TradingStrategies(), args)
         opportunities = strategies.analyze_market(market_data)
         
         # Print market info
@@ -89,47 +162,19 @@ def analyze_market():
         print(f"Available Trades: {len(market_data.available_trades)}")
         print(f"Competing Trades: {len(market_data.competing_trades)}")
         
-        # Print opportunities
-        if opportunities['basic']:
-            print("\nBasic Trading Opportunities:")
-            print("=" * 50)
-            for strategy_name, opp in opportunities['basic']:
-                print(f"\n{strategy_name}:")
-                print(f"Buy {opp.buy_currency} at {opp.buy_ratio}")
-                print(f"Sell {opp.sell_currency} at {opp.sell_ratio}")
-                print(f"Potential Profit: {opp.potential_profit*100:.2f}%")
-                print(f"Recommended Volume: {opp.trade_volume}")
-                print(f"Confidence: {opp.confidence*100:.2f}%")
-        
-        if opportunities['triangle']:
-            print("\nTriangle Arbitrage Opportunities:")
-            print("=" * 50)
-            for i, opp in enumerate(opportunities['triangle'], 1):
-                print(f"\nOpportunity {i}:")
-                print(f"Step 1: Trade {opp.step1[0]} -> {opp.step1[1]} at {opp.step1[2]}")
-                print(f"Step 2: Trade {opp.step2[0]} -> {opp.step2[1]} at {opp.step2[2]}")
-                print(f"Step 3: Trade {opp.step3[0]} -> {opp.step3[1]} at {opp.step3[2]}")
-                print(f"Total Profit: {opp.total_profit*100:.2f}%")
-                print(f"Safe Volume: {opp.min_volume}")
-                print(f"Confidence: {opp.confidence*100:.2f}%")
-        
-        if opportunities['market_making']:
-            print("\nMarket Making Opportunities:")
-            print("=" * 50)
-            for i, opp in enumerate(opportunities['market_making'], 1):
-                print(f"\nOpportunity {i}:")
-                print(f"Currency Pair: {opp.currency_pair[0]}/{opp.currency_pair[1]}")
-                print(f"Bid: {opp.bid_price}, Ask: {opp.ask_price}")
-                print(f"Spread: {opp.spread*100:.2f}%")
-                print(f"Volume: {opp.volume}")
-                print(f"Volatility: {opp.volatility*100:.2f}%")
-                print(f"Confidence: {opp.confidence*100:.2f}%")
+        # Print opportunities, one write per non-empty section
+        for key, title, format_opportunity in OPPORTUNITY_SECTIONS:
+            if opportunities[key]:
+                print(f"\n{title}:\n{'=' * 50}")
+                print("\n".join(
+                    format_opportunity(i, opp) for i, opp in enumerate(opportunities[key], 1)
+                ))
                 
     except Exception as e:
         print(f"Error analyzing market: {e}")
         sys.exit(1)
 
-def test_strategies():
+def test_strategies(args: argparse.Namespace):
     """Test trading strategies with historical data"""
     try:
         print("\nTesting trading strategies...")
@@ -141,39 +186,54 @@ def test_strategies():
             return
             
         # Initialize strategies
-        strategies = TradingStrategies()
+        strategies = configure_strategies(TradingStrategies(), args)
         
-        # Load and analyze each file
-        for data_file in sorted(market_data_dir.glob("*.json")):
-            print(f"\nAnalyzing {data_file.name}...")
-            
-            # Load market data
-            market_data = strategies.load_market_data(data_file)
-            
-            # Update history
-            strategies.update_market_history(
-                (market_data.i_want, market_data.i_have),
-                {
-                    'market_ratio': market_data.market_ratio,
-                    'available_trades': market_data.available_trades
-                }
-            )
-            
-            # Analyze opportunities
-            opportunities = strategies.analyze_market(market_data)
-            
-            # Print summary
-            total_opps = (
-                len(opportunities['basic']) +
-                len(opportunities['triangle']) +
-                len(opportunities['market_making'])
-            )
-            print(f"Found {total_opps} potential opportunities")
+        # Load the files in parallel, analyzing each in order on this thread as soon as it is decoded
+        data_files = sorted(market_data_dir.glob("*.json"))
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            loaded = pool.map(strategies.load_market_data, data_files)
+            for data_file, market_data in zip(data_files, loaded):
+                print(f"\nAnalyzing {data_file.name}...")
+                
+                # Update history
+                strategies.update_market_history(
+                    (market_data.i_want, market_data.i_have),
+                    {
+                        'market_ratio': market_data.market_ratio,
+                        'available_trades': market_data.available_trades
+                    }
+                )
+                
+                # Analyze opportunities
+                opportunities = strategies.analyze_market(market_data)
+                
+                # Print summary
+                total_opps = (
+                    len(opportunities['basic']) +
+                    len(opportunities['cycle']) +
+                    len(opportunities['market_making'])
+                )
+                print(f"Found {total_opps} potential opportunities")
             
     except Exception as e:
         print(f"Error testing strategies: {e}")
         sys.exit(1)
 
+def count_pairs(n: int) -> int:
+    """Number of unordered pairs that can be built from n items"""
+    return n * (n - 1) // 2
+
+def pick_pairs(pairs: Iterator[Tuple[str, str]], picks: List[int]) -> Iterator[Tuple[str, str]]:
+    """Yield only the pairs at the given (sorted) indices, walking the iterator once"""
+    wanted = iter(picks)
+    target = next(wanted, None)
+    for index, pair in enumerate(pairs):
+        if target is None:
+            return
+        if index == target:
+            yield pair
+            target = next(wanted, None)
+
 def scan_market_pairs(args: argparse.Namespace):
     """Scan the entire market for all possible currency pairs"""
     from itertools import combinations
@@ -183,7 +243,8 @@ def scan_market_pairs(args: argparse.Namespace):
     print("\nInitializing market scanner...")
     
     # Initialize bot for scanning
-    bot = TradingBot()
+    bot = get_bot()
+    configure_strategies(bot.strategies, args)
     
     # Update bot parameters from command line
     bot.scan_delay = args.scan_delay
@@ -192,13 +253,16 @@ def scan_market_pairs(args: argparse.Namespace):
     tradeables = load_tradeables()
     print(f"Loaded {len(tradeables)} tradeable items")
     
-    # Generate all possible pairs (only one direction)
-    pairs = list(combinations(sorted(tradeables), 2))
-    print(f"Generated {len(pairs)} possible pairs")
+    # Generate all possible pairs lazily (only one direction)
+    pairs = combinations(sorted(tradeables), 2)
+    total_pairs = count_pairs(len(tradeables))
+    print(f"Generated {total_pairs} possible pairs")
     
     # If max_pairs specified, randomly sample pairs
-    if args.max_pairs and args.max_pairs < len(pairs):
-        pairs = random.sample(pairs, args.max_pairs)
+    if args.max_pairs and args.max_pairs < total_pairs:
+        picks = sorted(random.sample(range(total_pairs), args.max_pairs))
+        pairs = pick_pairs(pairs, picks)
+        total_pairs = args.max_pairs
         print(f"Randomly selected {args.max_pairs} pairs to scan")
     
     # Create results directory with timestamp
@@ -209,36 +273,34 @@ def scan_market_pairs(args: argparse.Namespace):
     print("\nStarting market scan...")
     print(f"Results will be saved in: {results_dir}")
     
-    total_pairs = len(pairs)
     successful_scans = 0
     failed_scans = 0
+    i = 0
     
-    for i, (currency1, currency2) in enumerate(pairs, 1):
-        print(f"\nScanning pair {i}/{total_pairs}: {currency1} <-> {currency2}")
+    async def run_scan():
+        nonlocal i, successful_scans, failed_scans
         
-        try:
-            # Scan in one direction only - we'll get both directions' data
-            market_data = bot.scan_market(currency1, currency2)
+        # Scan in one direction only - we'll get both directions' data
+        async for (currency1, currency2), market_data in bot.scan_pairs_async(pairs, args.concurrency):
+            i += 1
+            logger.info("\nScanned pair %d/%d: %s <-> %s", i, total_pairs, currency1, currency2)
+            
             if market_data:
                 successful_scans += 1
                 # The reverse direction data is in competing_trades
             else:
                 failed_scans += 1
                 
-            # Add delay between pairs
-            time.sleep(bot.scan_delay)
-            
-        except KeyboardInterrupt:
-            print("\nScan interrupted by user")
-            break
-        except Exception as e:
-            print(f"Error scanning pair: {e}")
-            failed_scans += 1
-            
-        # Print progress
-        print(f"\nProgress: {i}/{total_pairs} pairs")
-        print(f"Successful scans: {successful_scans}")
-        print(f"Failed scans: {failed_scans}")
+            # Print progress as one record
+            logger.info(
+                "\nProgress: %d/%d pairs\nSuccessful scans: %d\nFailed scans: %d",
+                i, total_pairs, successful_scans, failed_scans
+            )
+    
+    try:
+        asyncio.run(run_scan())
+    except KeyboardInterrupt:
+        print("\nScan interrupted by user")
     
     print("\nMarket scan complete!")
     print(f"Total pairs scanned: {i}/{total_pairs}")
@@ -250,92 +312,91 @@ def scan_trade_list(args: argparse.Namespace):
     """Scan market for trading opportunities among specified items"""
     from itertools import combinations
     from datetime import datetime
-    import json
+    from src.utils.config import load_trade_list
     
     print("\nInitializing trade list scanner...")
     
     # Initialize bot for scanning
-    bot = TradingBot()
+    bot = get_bot()
+    configure_strategies(bot.strategies, args)
     bot.scan_delay = args.scan_delay
     bot.min_liquidity = args.min_liquidity
     bot.min_confidence = args.min_confidence
     
-    # Load trade list
+    # Load trade list (duplicate lines would only cause duplicate scans)
     try:
-        with open(args.trade_list) as f:
-            trade_items = [line.strip() for line in f if line.strip()]
+        trade_items = load_trade_list(args.trade_list)
         print(f"Loaded {len(trade_items)} items from trade list")
     except Exception as e:
         print(f"Error loading trade list: {e}")
         return
     
-    # Generate all possible pairs (only one direction)
-    pairs = list(combinations(sorted(trade_items), 2))
-    print(f"Generated {len(pairs)} possible trading pairs")
+    # Generate all possible pairs lazily (only one direction)
+    pairs = combinations(trade_items, 2)
+    total_pairs = count_pairs(len(trade_items))
+    print(f"Generated {total_pairs} possible trading pairs")
     
     # Create results directory with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     results_dir = Path(f"data/trade_scans/{timestamp}")
     results_dir.mkdir(parents=True, exist_ok=True)
     
-    # Create opportunities file
-    opportunities_file = results_dir / "opportunities.json"
-    opportunities = []
+    # Opportunities are appended one JSON record per line as they are found
+    opportunities_file = results_dir / "opportunities.jsonl"
     
     print("\nStarting trade scan...")
     print(f"Results will be saved in: {results_dir}")
     
-    total_pairs = len(pairs)
     successful_scans = 0
     failed_scans = 0
     opportunities_found = 0
+    i = 0
     
-    for i, (currency1, currency2) in enumerate(pairs, 1):
-        print(f"\nScanning pair {i}/{total_pairs}: {currency1} -> {currency2}")
+    async def run_scan():
+        nonlocal i, successful_scans, failed_scans, opportunities_found
         
-        try:
-            # Scan market in one direction
-            market_data = bot.scan_market(currency1, currency2)
-            if market_data:
-                successful_scans += 1
-                
-                # Check opportunities in both directions
-                # Forward direction
-                if bot.evaluate_opportunity(market_data):
-                    opportunities_found += 1
-                    opportunities.append({
-                        "timestamp": datetime.now().isoformat(),
-                        "pair": [currency1, currency2],
-                        "direction": "forward",
-                        "market_data": market_data.to_dict()
-                    })
-                
-                # Reverse direction (using competing_trades)
-                # Note: You might want to create a reversed MarketData object here
-                # if your evaluation logic needs it in a specific format
-                
-                # Save opportunities after each find
-                if opportunities:
-                    with open(opportunities_file, 'w') as f:
-                        json.dump(opportunities, f, indent=2)
-            else:
+        # Scan market in one direction
+        async for (currency1, currency2), market_data in bot.scan_pairs_async(pairs, args.concurrency):
+            i += 1
+            logger.info("\nScanned pair %d/%d: %s -> %s", i, total_pairs, currency1, currency2)
+            
+            try:
+                if market_data:
+                    successful_scans += 1
+                    
+                    # Check opportunities in both directions
+                    # Forward direction
+                    if bot.evaluate_opportunity(market_data):
+                        opportunities_found += 1
+                        opportunities_log.write(orjson.dumps({
+                            "timestamp": datetime.now(),  # orjson renders ISO 8601 natively
+                            "pair": [currency1, currency2],
+                            "direction": "forward",
+                            "market_data": market_data  # Dataclasses serialize natively too
+                        }, option=orjson.OPT_APPEND_NEWLINE))
+                    
+                    # Reverse direction (using competing_trades)
+                    # Note: You might want to create a reversed MarketData object here
+                    # if your evaluation logic needs it in a specific format
+                else:
+                    failed_scans += 1
+                    
+            except Exception as e:
+                logger.error("Error scanning pair: %s", e)
                 failed_scans += 1
                 
-            # Add delay between pairs
-            time.sleep(bot.scan_delay)
-            
+            # Print progress as one record
+            logger.info(
+                "\nProgress: %d/%d pairs\nSuccessful scans: %d\nFailed scans: %d\nOpportunities found: %d",
+                i, total_pairs, successful_scans, failed_scans, opportunities_found
+            )
+    
+    # Unbuffered so every record reaches disk as soon as it is written
+    with open(opportunities_file, 'ab', buffering=0) as opportunities_log:
+        try:
+            asyncio.run(run_scan())
         except KeyboardInterrupt:
             print("\nScan interrupted by user")
-            break
-        except Exception as e:
-            print(f"Error scanning pair: {e}")
-            failed_scans += 1
-            
-        # Print progress
-        print(f"\nProgress: {i}/{total_pairs} pairs")
-        print(f"Successful scans: {successful_scans}")
-        print(f"Failed scans: {failed_scans}")
-        print(f"Opportunities found: {opportunities_found}")
     
     print("\nTrade scan complete!")
     print(f"Total pairs scanned: {i}/{total_pairs}")
@@ -344,11 +405,40 @@ def scan_trade_list(args: argparse.Namespace):
     print(f"Opportunities found: {opportunities_found}")
     print(f"Results saved in: {results_dir}")
 
+def setup_logging(args: argparse.Namespace) -> Optional[QueueListener]:
+    """Configure console logging for the chosen mode
+    
+    Finite modes log synchronously, so their records stay in order with the
+    printed report. The bot loop runs until interrupted, so its records are
+    written by a background listener and the loop never waits on the console;
+    the caller stops the returned listener to flush them.
+    """
+    if args.mode != 'bot':
+        logging.basicConfig(level=args.log_level, format="%(message)s", stream=sys.stdout)
+        return None
+        
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    logging.basicConfig(level=args.log_level, format="%(message)s", handlers=[QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
 def main():
     """Main entry point"""
     parser = setup_argparse()
     args = parser.parse_args()
-    
+    if args.max_cycle_length is not None and args.max_cycle_length < 2:
+        parser.error("--max-cycle-length must be at least 2")
+        
+    listener = setup_logging(args)
+    try:
+        run_mode(parser, args)
+    finally:
+        if listener is not None:
+            listener.stop()
+
+def run_mode(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Run the operation mode selected on the command line"""
     print("Starting POE2 Currency Trading Bot...")
     
     if args.mode == 'record':
@@ -386,9 +476,9 @@ def main():
         else:
             record_sequence(args.sequence)
     elif args.mode == 'analyze':
-        analyze_market()
+        analyze_market(args)
     elif args.mode == 'test':
-        test_strategies()
+        test_strategies(args)
     elif args.mode == 'scan':
         if args.trade_list:
             scan_trade_list(args)
@@ -397,13 +487,15 @@ def main():
     elif args.mode == 'bot':
         # Initialize and run trading bot
         print("Initializing trading bot...")
-        bot = TradingBot()
+        bot = get_bot()
+        configure_strategies(bot.strategies, args)
         
         # Update bot parameters from command line
         bot.min_liquidity = args.min_liquidity
         bot.min_confidence = args.min_confidence
         bot.scan_delay = args.scan_delay
         bot.trade_cooldown = args.trade_cooldown
+        bot.scan_batch_size = args.concurrency
         
         # Set trading mode based on arguments
         if args.trade_list:
@@ -1,18 +1,29 @@
+import asyncio
+import logging
 import random
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterable, AsyncIterator
 from datetime import datetime
-import json
-import pyautogui
-from itertools import permutations
+import orjson
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, chain
 
-from .trade.strategies import TradingStrategies, MarketData
-from .utils.market_gemini import analyze_latest_market
+from .trade.strategies import TradingStrategies
 from .capture.click_recorder import ClickRecorder, get_category_for_item
 from .utils.config import CURRENCY_PAIRS, CURRENCY_WEIGHTS
 from .models.market_data import MarketData
 
+logger = logging.getLogger("scan")
+
+@lru_cache(maxsize=None)
+def sequence_keys(currency: str) -> Tuple[str, str]:
+    """Get the (i_want, i_have) recorder sequence keys for a currency name, built once per name"""
+    item_name = currency.lower().replace(' ', '_')
+    return f"i_want_{item_name}", f"i_have_{item_name}"
+
 class TradingBot:
     def __init__(self):
         self.recorder = ClickRecorder()
@@ -21,22 +32,89 @@ class TradingBot:
         self.min_confidence = 0.8  # Minimum confidence score
         self.scan_delay = 1.0  # Delay between market scans in seconds
         self.trade_cooldown = 30  # Cooldown between trades in seconds
-        self.last_trade_time = datetime.min
+        self.last_trade_time = float("-inf")  # time.monotonic() of the last trade
         self.fixed_pair = None  # Fixed trading pair (currency1, currency2)
         self.last_direction = False  # False = currency1->currency2, True = currency2->currency1
-        self.trade_list = None  # List of pairs to trade
+        self.trade_list = None  # Indices of the trade list pairs, see get_next_pair
+        self.trade_currencies: Tuple[str, ...] = ()  # Currencies the trade list pairs are drawn from
         self.current_trade_list_index = 0  # Current index in trade list
+        self.ui_lock: Optional[asyncio.Lock] = None  # Serializes UI playback during async scans
+        self.analysis_depth = 2  # Screenshot analyses allowed in flight behind UI playback
+        self.analyzer_pool = ThreadPoolExecutor(max_workers=self.analysis_depth)  # Screenshot analysis off the UI thread
+        self.scan_batch_size = 1  # Pairs scanned concurrently per bot round
+        self.pair_backoff = 5.0  # Seconds a pair is skipped after its first scan without opportunities
+        self.max_fail_streak = 8  # Caps the exponential backoff at pair_backoff * 2**7
+        self.pair_stats: Dict[Tuple[str, str], Tuple[float, int]] = {}  # pair -> (last scan time, fail streak)
+        self.rescan_pairs: List[Tuple[str, str]] = []  # Pairs whose snapshot went stale after a trade, scanned first next round
+        
+        # Sequences every scan needs, checked once instead of after each pair's playback
+        missing = self.recorder.missing_sequences({"market": "market"})
+        self.market_sequence_ready = not missing
+        if missing:
+            print("Warning: no market sequence recorded, market scans will be skipped")
+        self.currencies = tuple(CURRENCY_WEIGHTS)  # Candidates for random pair selection
+        # Cumulative weights so random.choices skips rebuilding them on every draw
+        self.currency_cum_weights = tuple(accumulate(CURRENCY_WEIGHTS[item] for item in self.currencies))
         
     def get_next_pair(self) -> Tuple[str, str]:
-        """Get next currency pair to trade"""
+        """Get next currency pair to trade, passing over pairs still backing off"""
+        if self.trade_list:
+            attempts = len(self.trade_list)
+        elif self.fixed_pair:
+            attempts = 1
+        else:
+            attempts = 10
+            
+        for _ in range(attempts):
+            pair = self.draw_pair()
+            if not self.pair_backing_off(pair):
+                return pair
+        return pair  # Everything is backing off, scan the last draw anyway
+        
+    def pair_backing_off(self, pair: Tuple[str, str]) -> bool:
+        """Check if a pair's recent scans found nothing and it should be skipped for now"""
+        stats = self.pair_stats.get(pair)
+        if not stats or not stats[1]:
+            return False
+        last_scan, fail_streak = stats
+        return time.monotonic() - last_scan < self.pair_backoff * 2 ** (fail_streak - 1)
+        
+    def record_pair_outcome(self, pair: Tuple[str, str], found: bool):
+        """Reset a pair's backoff after an opportunity, otherwise double it"""
+        if found:
+            # Pairs without stats never back off, so only failing pairs are tracked
+            self.pair_stats.pop(pair, None)
+            return
+        fail_streak = min(self.pair_stats.get(pair, (0.0, 0))[1] + 1, self.max_fail_streak)
+        self.pair_stats[pair] = (time.monotonic(), fail_streak)
+        
+    def next_batch(self) -> List[Tuple[str, str]]:
+        """Draw the pairs for the next scan round, each pair at most once"""
+        size = max(1, self.scan_batch_size)
+        # Pairs left stale by a trade are scanned again first
+        batch: Dict[Tuple[str, str], None] = dict.fromkeys(self.rescan_pairs[:size])
+        del self.rescan_pairs[:size]
+        # Fixed and short trade lists have fewer distinct pairs than the batch
+        # size, so give up after a bounded number of draws
+        for _ in range(2 * size):
+            if len(batch) == size:
+                break
+            batch[self.get_next_pair()] = None
+        return list(batch)
+        
+    def draw_pair(self) -> Tuple[str, str]:
+        """Draw the next candidate pair for the current trading mode"""
         if self.trade_list:
             # Get pair from trade list
             if self.current_trade_list_index >= len(self.trade_list):
                 # Reset to beginning of list
                 self.current_trade_list_index = 0
-            pair = self.trade_list[self.current_trade_list_index]
+            # Pairs follow permutations(currencies, 2) order and are decoded on demand
+            i, j = divmod(self.trade_list[self.current_trade_list_index], len(self.trade_currencies) - 1)
+            if j >= i:
+                j += 1
             self.current_trade_list_index += 1
-            return pair
+            return self.trade_currencies[i], self.trade_currencies[j]
         elif self.fixed_pair:
             # Only alternate direction if no opportunity was found in current direction
             if not hasattr(self, 'last_opportunity_found') or not self.last_opportunity_found:
@@ -47,143 +125,210 @@ class TradingBot:
             return self.fixed_pair[0], self.fixed_pair[1]  # Original direction
         else:
             # Random pair selection
-            items = list(CURRENCY_WEIGHTS.keys())
-            weights = [CURRENCY_WEIGHTS[item] for item in items]
-            
-            # Get first currency with higher weight for common currencies
-            i_want = random.choices(items, weights=weights, k=1)[0]
+            items = self.currencies
+            cum_weights = self.currency_cum_weights
             
-            # Get second currency, ensuring it's different
+            # Draw both currencies in one call (common currencies weigh more),
+            # redrawing only on the rare collision
             while True:
-                i_have = random.choices(items, weights=weights, k=1)[0]
+                i_want, i_have = random.choices(items, cum_weights=cum_weights, k=2)
                 if i_have != i_want:
-                    break
-                
-            return i_want, i_have
+                    return i_want, i_have
             
     def set_trade_list(self, trade_list_path: str):
         """Load currencies from file and generate all possible trading pairs"""
         try:
-            # Load single currencies from file
-            with open(trade_list_path) as f:
-                currencies = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-            
-            # Generate all possible pairs (permutations since order matters for trading)
-            pairs = list(permutations(currencies, 2))
+            # Load single currencies from file in one read
+            text = Path(trade_list_path).read_text(encoding='utf-8')
+            currencies = [line for line in (raw.strip() for raw in text.splitlines()) if line and not line.startswith('#')]
             
-            self.trade_list = pairs
+            # Every ordered pair is traded (order matters), but only the
+            # currencies are stored and pairs are decoded from their index
+            self.trade_currencies = tuple(currencies)
+            self.trade_list = range(len(currencies) * (len(currencies) - 1))
+            self.current_trade_list_index = 0
+            self.rescan_pairs.clear()
+            # Drop backoff stats of pairs that are no longer traded
+            traded = set(currencies)
+            self.pair_stats = {pair: stats for pair, stats in self.pair_stats.items() if pair[0] in traded and pair[1] in traded}
             print(f"\nLoaded {len(currencies)} currencies:")
             for currency in currencies:
                 print(f"- {currency}")
                 
-            print(f"\nGenerated {len(pairs)} trading pairs:")
-            for i_want, i_have in pairs:
-                print(f"- {i_want} -> {i_have}")
+            print(f"\nGenerated {len(self.trade_list)} trading pairs")
                 
+        except FileNotFoundError:
+            print(f"Trade list not found: {trade_list_path}")
+            self.trade_list = None
+            self.trade_currencies = ()
         except Exception as e:
             print(f"Error loading trade list: {e}")
             self.trade_list = None
+            self.trade_currencies = ()
             
-    def scan_market(self, i_want: str, i_have: str, current_i_want: Optional[str] = None) -> Optional[MarketData]:
-        """Scan market for a given currency pair"""
-        try:
-            print(f"\nScanning market for {i_want}/{i_have}...")
+    def capture_market(self, i_want: str, i_have: str, current_i_want: Optional[str] = None, current_i_have: Optional[str] = None) -> Optional[Path]:
+        """Drive the UI to a currency pair and capture its market screenshot"""
+        if not self.market_sequence_ready:
+            return None
             
-            # Play i_want sequence (will skip if current_i_want matches)
-            i_want_key = f"i_want_{i_want}"
-            self.recorder.play_sequence(i_want_key, "select", current_i_want=current_i_want)
+        print(f"\nScanning market for {i_want}/{i_have}...")
+        
+        # Play i_want sequence (will skip its tab if current_i_want matches)
+        # and the i_have sequence unless it is already selected, in one batch
+        select_keys = [sequence_keys(i_want)[0]]
+        if i_have != current_i_have:
+            select_keys.append(sequence_keys(i_have)[1])
+        else:
+            print(f"Keeping current i_have {i_have}...")
+        self.recorder.play_sequences(select_keys, "select", current_i_want=current_i_want)
+        
+        # Play the market sequence to capture data
+        self.recorder.last_screenshot = None
+        self.recorder.screenshot_saved = None
+        self.recorder.play_sequence("market", "market")
+        
+        # Wait for the screenshot to be written instead of a fixed delay
+        return self.recorder.wait_for_screenshot(timeout=2.0)
+        
+    def record_market_data(self, market_data: Optional[MarketData]) -> Optional[MarketData]:
+        """Update strategy history with analyzed market data
+        
+        Always called from the scanning thread so history is never mutated
+        concurrently, even when the analysis itself ran on a worker.
+        """
+        if market_data:
+            # Update strategies with new market data
+            self.strategies.update_market_history(
+                (market_data.i_want, market_data.i_have),
+                market_data.to_dict()  # Use to_dict() to get all fields
+            )
+            return market_data
+        else:
+            print("No trades found in market data")
+            return None
             
-            # Always play i_have sequence
-            i_have_key = f"i_have_{i_have}"
-            self.recorder.play_sequence(i_have_key, "select")
+    def scan_market(self, i_want: str, i_have: str, current_i_want: Optional[str] = None, current_i_have: Optional[str] = None) -> Optional[MarketData]:
+        """Scan market for a given currency pair"""
+        try:
+            image_path = self.capture_market(i_want, i_have, current_i_want, current_i_have)
+            if image_path is None:
+                print("No market screenshot captured")
+                return None
+                
+            # Analyze the market screenshot, importing the Gemini client only once scanning
+            from .utils.market_gemini import analyze_market_screenshot
+            return self.record_market_data(analyze_market_screenshot(image_path))
             
-            # Play the market sequence to capture data
-            self.recorder.play_sequence("market", "market")
-            time.sleep(0.2)  # Wait for UI to update
+        except Exception as e:
+            print(f"Error scanning market: {e}")
+            return None
             
-            # Analyze the market screenshot
-            market_data = analyze_latest_market()
-            if market_data:
-                # Update strategies with new market data
-                self.strategies.update_market_history(
-                    (market_data.i_want, market_data.i_have),
-                    market_data.to_dict()  # Use to_dict() to get all fields
-                )
-                return market_data
-            else:
-                print("No trades found in market data")
+    async def scan_market_async(self, i_want: str, i_have: str) -> Optional[MarketData]:
+        """Scan market for a currency pair without blocking the event loop
+        
+        The recorder drives a single game window, so UI playback is serialized
+        on a lock and only the screenshot analysis runs concurrently.
+        """
+        try:
+            async with self.ui_lock:
+                image_path = await asyncio.to_thread(self.capture_market, i_want, i_have)
+            if image_path is None:
+                print("No market screenshot captured")
                 return None
+                
+            from .utils.market_gemini import analyze_market_screenshot
+            market_data = await asyncio.to_thread(analyze_market_screenshot, image_path)
+            return self.record_market_data(market_data)
             
         except Exception as e:
             print(f"Error scanning market: {e}")
             return None
             
-    def evaluate_opportunity(self, market_data: MarketData) -> bool:
-        """Evaluate if a market opportunity is worth trading"""
-        # Check basic liquidity
-        total_volume = sum(trade.stock for trade in market_data.available_trades)
-        if total_volume < self.min_liquidity:
-            print(f"Insufficient liquidity: {total_volume} < {self.min_liquidity}")
-            return False
+    async def scan_pairs_async(self, pairs: Iterable[Tuple[str, str]], concurrency: int = 4) -> AsyncIterator[Tuple[Tuple[str, str], Optional[MarketData]]]:
+        """Scan pairs with at most `concurrency` scans in flight, yielding results as they complete"""
+        pairs = iter(pairs)
+        results: asyncio.Queue = asyncio.Queue()
+        self.ui_lock = asyncio.Lock()
+        
+        async def worker():
+            try:
+                # Workers share one iterator so pairs are never materialized
+                for pair in pairs:
+                    market_data = await self.scan_market_async(*pair)
+                    await results.put((pair, market_data))
+                    await asyncio.sleep(self.scan_delay)
+            finally:
+                await results.put(None)
+                
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        try:
+            remaining = len(workers)
+            while remaining:
+                result = await results.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
             
-        # Analyze with all strategies
-        opportunities = self.strategies.analyze_market(market_data)
+    def evaluate_opportunity(self, market_data: MarketData, opportunities: Optional[Dict[str, List]] = None) -> Optional[Tuple[str, str, Any]]:
+        """Evaluate if a market opportunity is worth trading
         
-        # Check if we have any high confidence opportunities
-        has_good_opportunity = False
+        Returns the best (strategy_type, strategy_name, opportunity) at or above
+        the minimum confidence, else None, so execute_trade can act on it without
+        searching again. Callers that already analyzed the snapshot can pass the
+        opportunities in.
+        """
+        # Check basic liquidity, stopping as soon as the threshold is met
+        total_volume = 0
+        for trade in market_data.available_trades:
+            total_volume += trade.stock
+            if total_volume >= self.min_liquidity:
+                break
+        else:
+            if total_volume < self.min_liquidity:
+                print(f"Insufficient liquidity: {total_volume} < {self.min_liquidity}")
+                return None
+            
+        # Analyze with all strategies unless the caller already has
+        if opportunities is None:
+            opportunities = self.strategies.analyze_market(market_data)
         
-        if opportunities['basic']:
-            for _, opp in opportunities['basic']:
-                if opp.confidence >= self.min_confidence:
-                    print(f"Found basic opportunity with {opp.confidence:.2%} confidence")
-                    has_good_opportunity = True
-                    
-        if opportunities['triangle']:
-            for opp in opportunities['triangle']:
-                if opp.confidence >= self.min_confidence:
-                    print(f"Found triangle opportunity with {opp.confidence:.2%} confidence")
-                    has_good_opportunity = True
-                    
-        if opportunities['market_making']:
-            for opp in opportunities['market_making']:
-                if opp.confidence >= self.min_confidence:
-                    print(f"Found market making opportunity with {opp.confidence:.2%} confidence")
-                    has_good_opportunity = True
+        # Find the best high confidence opportunity across all strategies in one pass
+        candidates = chain(
+            (('basic', strategy_name, opp) for strategy_name, opp in opportunities['basic']),
+            (('cycle', 'Cycle Arbitrage', opp) for opp in opportunities['cycle']),
+            (('market_making', 'Market Making', opp) for opp in opportunities['market_making'])
+        )
+        best_opp = max(
+            (candidate for candidate in candidates if candidate[2].confidence >= self.min_confidence),
+            key=lambda candidate: candidate[2].confidence,
+            default=None
+        )
                     
-        return has_good_opportunity
+        if best_opp:
+            print(f"Found {best_opp[1]} opportunity with {best_opp[2].confidence:.2%} confidence")
+        return best_opp
         
-    def execute_trade(self, market_data: MarketData):
-        """Execute a trade based on market data"""
+    def cooldown_remaining(self) -> float:
+        """Seconds left before another trade may be placed"""
+        return max(0.0, self.trade_cooldown - (time.monotonic() - self.last_trade_time))
+        
+    def execute_trade(self, market_data: MarketData, best_opp: Optional[Tuple[str, str, Any]] = None):
+        """Execute a trade based on market data and, if given, its evaluated best opportunity"""
         # Check trade cooldown
-        if (datetime.now() - self.last_trade_time).total_seconds() < self.trade_cooldown:
-            print("Trade cooldown still active")
+        remaining = self.cooldown_remaining()
+        if remaining > 0:
+            print(f"Trade cooldown still active ({remaining:.1f}s left)")
             return
             
         try:
-            # Get trading opportunities
-            opportunities = self.strategies.analyze_market(market_data)
-            
-            # Find best opportunity
-            best_opp = None
-            best_confidence = 0
-            
-            # Check basic opportunities (arbitrage)
-            for strategy_name, opp in opportunities['basic']:
-                if opp.confidence > best_confidence:
-                    best_opp = ('basic', strategy_name, opp)
-                    best_confidence = opp.confidence
-                    
-            # Check triangle opportunities
-            for opp in opportunities['triangle']:
-                if opp.confidence > best_confidence:
-                    best_opp = ('triangle', 'Triangle Arbitrage', opp)
-                    best_confidence = opp.confidence
-                    
-            # Check market making opportunities
-            for opp in opportunities['market_making']:
-                if opp.confidence > best_confidence:
-                    best_opp = ('market_making', 'Market Making', opp)
-                    best_confidence = opp.confidence
+            # Evaluate the market unless the caller already has
+            if best_opp is None:
+                best_opp = self.evaluate_opportunity(market_data)
                     
             if not best_opp:
                 print("No suitable trading opportunities found")
@@ -199,19 +344,15 @@ class TradingBot:
                 print(f"Volume: {opportunity.trade_volume}")
                 print(f"Expected profit: {opportunity.potential_profit*100:.2f}%")
                 
-                # Format currency names by replacing spaces with underscores and converting to lowercase
-                i_want_currency = opportunity.buy_currency.lower().replace(' ', '_')
-                i_have_currency = opportunity.sell_currency.lower().replace(' ', '_')
-                
-                i_want_key = f"i_want_{i_want_currency}"
-                i_have_key = f"i_have_{i_have_currency}"
+                # Look up the sequence keys for the currency names
+                i_want_key = sequence_keys(opportunity.buy_currency)[0]
+                i_have_key = sequence_keys(opportunity.sell_currency)[1]
                 
                 # Step 1: Buy at the lower ratio
                 print("\nExecuting buy trade...")
                 
                 # Navigate to the correct currencies
-                self.recorder.play_sequence(i_want_key, "select")
-                self.recorder.play_sequence(i_have_key, "select")
+                self.recorder.play_sequences([i_want_key, i_have_key], "select")
                 
                 # Input the amounts automatically
                 buy_amount = str(int(opportunity.trade_volume))
@@ -236,8 +377,7 @@ class TradingBot:
                 print("\nExecuting sell trade...")
                 
                 # Swap currencies (now we're selling what we just bought)
-                self.recorder.play_sequence(i_have_key, "select")
-                self.recorder.play_sequence(i_want_key, "select")
+                self.recorder.play_sequences([i_have_key, i_want_key], "select")
                 
                 # Input the amounts automatically (now selling what we bought)
                 sell_amount = have_amount
@@ -254,24 +394,20 @@ class TradingBot:
                 # Click the trade button
                 self.recorder.play_sequence("place_order", "trade")
                 
-            elif strategy_type == 'triangle':
-                # Execute triangle arbitrage
-                print("Executing triangle arbitrage:")
-                for i, step in enumerate([opportunity.step1, opportunity.step2, opportunity.step3], 1):
+            elif strategy_type == 'cycle':
+                # Execute cycle arbitrage
+                print("Executing cycle arbitrage:")
+                for i, step in enumerate(opportunity.steps, 1):
                     from_currency, to_currency, ratio = step
                     print(f"Step {i}: Trading {from_currency} -> {to_currency} at {ratio}")
                     print(f"Volume: {opportunity.min_volume}")
                     
-                    # Format currency names
-                    i_want_currency = to_currency.lower().replace(' ', '_')
-                    i_have_currency = from_currency.lower().replace(' ', '_')
-                    
-                    i_want_key = f"i_want_{i_want_currency}"
-                    i_have_key = f"i_have_{i_have_currency}"
+                    # Look up the sequence keys for the currency names
+                    i_want_key = sequence_keys(to_currency)[0]
+                    i_have_key = sequence_keys(from_currency)[1]
                     
                     # Navigate to the correct currencies
-                    self.recorder.play_sequence(i_want_key, "select")
-                    self.recorder.play_sequence(i_have_key, "select")
+                    self.recorder.play_sequences([i_want_key, i_have_key], "select")
                     
                     # Input the amounts automatically
                     want_amount = str(int(opportunity.min_volume))
@@ -300,16 +436,12 @@ class TradingBot:
                 print(f"Spread: {opportunity.spread*100:.2f}%")
                 print(f"Volume: {opportunity.volume}")
                 
-                # Format currency names
-                i_want_currency = quote.lower().replace(' ', '_')
-                i_have_currency = base.lower().replace(' ', '_')
-                
-                i_want_key = f"i_want_{i_want_currency}"
-                i_have_key = f"i_have_{i_have_currency}"
+                # Look up the sequence keys for the currency names
+                i_want_key = sequence_keys(quote)[0]
+                i_have_key = sequence_keys(base)[1]
                 
                 # Navigate to the correct currencies
-                self.recorder.play_sequence(i_want_key, "select")
-                self.recorder.play_sequence(i_have_key, "select")
+                self.recorder.play_sequences([i_want_key, i_have_key], "select")
                 
                 # Input the amounts automatically
                 want_amount = str(int(opportunity.volume))
@@ -327,7 +459,7 @@ class TradingBot:
                 self.recorder.play_sequence("place_order", "trade")
                 
             print("Trade executed successfully")
-            self.last_trade_time = datetime.now()
+            self.last_trade_time = time.monotonic()
             
             # Wait for trade cooldown
             print(f"Waiting {self.trade_cooldown} seconds before next trade...")
@@ -340,8 +472,16 @@ class TradingBot:
             
     def run(self):
         """Main bot loop"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\nStopping trading bot...")
+            
+    async def run_async(self):
+        """Main bot loop, scanning `scan_batch_size` pairs concurrently per round"""
         print("Starting trading bot...")
         self.last_opportunity_found = False
+        self.ui_lock = asyncio.Lock()
         
         # Print configuration based on mode
         if self.trade_list:
@@ -356,104 +496,143 @@ class TradingBot:
         print(f"- Minimum confidence: {self.min_confidence}")
         print(f"- Scan delay: {self.scan_delay}s")
         print(f"- Trade cooldown: {self.trade_cooldown}s")
+        print(f"- Pairs per scan round: {self.scan_batch_size}")
         
         while True:
             try:
-                # Get next currency pair
-                i_want, i_have = self.get_next_pair()
-                
-                # Scan market
-                market_data = self.scan_market(i_want, i_have)
-                if not market_data:
-                    print("No market data found, trying next pair...")
-                    self.last_opportunity_found = False
-                    time.sleep(self.scan_delay)
+                # Skip scanning while no trade could be placed anyway
+                remaining = self.cooldown_remaining()
+                if remaining > 0:
+                    await asyncio.sleep(min(self.scan_delay, remaining))
                     continue
+                    
+                # Get next batch of currency pairs
+                batch = self.next_batch()
+                
+                # Scan markets, UI playback is serialized but analysis overlaps
+                results = await asyncio.gather(*(
+                    self.scan_market_async(i_want, i_have) for i_want, i_have in batch
+                ))
+                
+                for position, (pair, market_data) in enumerate(zip(batch, results)):
+                    if not market_data:
+                        print("No market data found, trying next pair...")
+                        self.last_opportunity_found = False
+                        self.record_pair_outcome(pair, False)
+                        continue
+                    
+                    # Print market info
+                    print("\nMarket Information:")
+                    print("=" * 50)
+                    print(f"Want: {market_data.i_want}")
+                    print(f"Have: {market_data.i_have}")
+                    print(f"Market Ratio: {market_data.market_ratio}")
+                    print(f"Available Trades: {len(market_data.available_trades)}")
+                    print(f"Competing Trades: {len(market_data.competing_trades)}")
+                    
+                    # Evaluate and execute trade if opportunity exists
+                    best_opp = self.evaluate_opportunity(market_data)
+                    self.record_pair_outcome(pair, bool(best_opp))
+                    if best_opp:
+                        print("\nGood opportunity found! Executing trade...")
+                        self.last_opportunity_found = True
+                        
+                        # Trades drive the UI, run them one at a time
+                        async with self.ui_lock:
+                            await asyncio.to_thread(self.execute_trade, market_data, best_opp)
+                            
+                        # The other snapshots predate this trade and its cooldown,
+                        # rescan those pairs instead of trading on them
+                        self.rescan_pairs.extend(batch[position + 1:])
+                        break
+                    else:
+                        print("\nNo good opportunities found, trying next pair...")
+                        self.last_opportunity_found = False
+                        
+                await asyncio.sleep(self.scan_delay)
                 
-                # Print market info
-                print("\nMarket Information:")
-                print("=" * 50)
-                print(f"Want: {market_data.i_want}")
-                print(f"Have: {market_data.i_have}")
-                print(f"Market Ratio: {market_data.market_ratio}")
-                print(f"Available Trades: {len(market_data.available_trades)}")
-                print(f"Competing Trades: {len(market_data.competing_trades)}")
-                
-                # Evaluate and execute trade if opportunity exists
-                if self.evaluate_opportunity(market_data):
-                    print("\nGood opportunity found! Executing trade...")
-                    self.last_opportunity_found = True
-                    self.execute_trade(market_data)
-                else:
-                    print("\nNo good opportunities found, trying next pair...")
-                    self.last_opportunity_found = False
-                    time.sleep(self.scan_delay)
-                
-            except KeyboardInterrupt:
-                print("\nStopping trading bot...")
-                break
             except Exception as e:
                 print(f"Error in main loop: {e}")
                 self.last_opportunity_found = False
-                time.sleep(self.scan_delay)
+                await asyncio.sleep(self.scan_delay)
                 
+    def order_scan_pairs(self, pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Drop reverse duplicates and order pairs to minimize UI selections
+        
+        Pairs are grouped by i_want, and each next group starts with the i_have
+        the previous group ended on when it can, so that selection is kept too.
+        """
+        # Canonicalize once, keeping the direction that sorts first as before
+        unique: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for pair in pairs:
+            pair_key = pair if pair[0] < pair[1] else (pair[1], pair[0])
+            unique[pair_key] = min(unique.get(pair_key, pair), pair)
+            
+        groups: Dict[str, List[str]] = {}
+        for i_want, i_have in sorted(unique.values()):
+            groups.setdefault(i_want, []).append(i_have)
+            
+        ordered = []
+        current_i_have = None
+        while groups:
+            # Greedy: prefer a group that can keep the current i_have selected
+            i_want = next((want for want, haves in groups.items() if current_i_have in haves), next(iter(groups)))
+            haves = groups.pop(i_want)
+            if current_i_have in haves:
+                haves.remove(current_i_have)
+                haves.insert(0, current_i_have)
+            ordered.extend((i_want, i_have) for i_have in haves)
+            current_i_have = haves[-1]
+        return ordered
+        
     def scan_market_pairs(self, pairs: List[Tuple[str, str]], output_dir: Path) -> Dict[str, Any]:
         """Scan multiple market pairs and save results"""
-        total_pairs = len(pairs)
         successful_scans = 0
         failed_scans = 0
         opportunities_found = 0
         
-        # Track which pairs we've already scanned (in reverse)
-        scanned_pairs = set()
-        
-        # Sort pairs to group by i_want to minimize switching
-        sorted_pairs = sorted(pairs, key=lambda x: x[0])
+        # Order pairs to minimize switching, skipping pairs scanned in reverse
+        ordered_pairs = self.order_scan_pairs(pairs)
+        total_pairs = len(ordered_pairs)
+        scanned = 0
         
         print(f"\nStarting market scan...")
+        if total_pairs < len(pairs):
+            print(f"Skipping {len(pairs) - total_pairs} reverse duplicate pairs")
         print(f"Results will be saved in: {output_dir}")
         
-        # Initialize current_i_want to None to force first i_want click
-        current_i_want = None
+        # Screenshots are analyzed on a worker while the next pair is played back;
+        # UI playback itself stays serial since it drives a single game window
+        pending = deque()
         
-        for i, (i_want, i_have) in enumerate(sorted_pairs, 1):
-            # Skip if we've already scanned this pair in reverse
-            pair_key = tuple(sorted([i_want, i_have]))
-            if pair_key in scanned_pairs:
-                print(f"\nSkipping pair {i}/{total_pairs}: {i_want} -> {i_have} (already scanned in reverse)")
-                continue
-                
-            print(f"\nScanning pair {i}/{total_pairs}: {i_want} -> {i_have}")
-            scanned_pairs.add(pair_key)
-            
+        def finish_scan(i_want: str, i_have: str, analysis: Optional[Future]):
+            nonlocal successful_scans, failed_scans, opportunities_found
             try:
-                # Capture and analyze market data
-                market_data = self.scan_market(i_want, i_have, current_i_want)
-                current_i_want = i_want  # Update current i_want after scan
+                if analysis is None:
+                    failed_scans += 1
+                    return
+                    
+                market_data = self.record_market_data(analysis.result())
                 
                 # Save market data
                 if market_data:
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    market_data_file = output_dir / f"{timestamp}_market_data.json"
                     
-                    # Get opportunities and convert them to dict
+                    # Get opportunities, orjson serializes the dataclasses directly
                     opportunities = self.strategies.analyze_market(market_data)
-                    opportunities_dict = {
-                        'basic': [(name, opp.to_dict()) for name, opp in opportunities['basic']],
-                        'triangle': [opp.to_dict() for opp in opportunities['triangle']],
-                        'market_making': [opp.to_dict() for opp in opportunities['market_making']]
-                    }
                     
                     # Save both market data and opportunities
                     data_to_save = {
-                        'market_data': market_data.to_dict(),
-                        'opportunities': opportunities_dict,
+                        'market_data': market_data,
+                        'opportunities': opportunities,
                         'timestamp': timestamp,
                         'pair': {'i_want': i_want, 'i_have': i_have}
                     }
                     
-                    with open(market_data_file, "w") as f:
-                        json.dump(data_to_save, f, indent=2)
+                    results_file.write(orjson.dumps(
+                        data_to_save,
+                        option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+                    ))
                     
                     # Mark scan as successful if we got any market data
                     successful_scans += 1
@@ -463,7 +642,7 @@ class TradingBot:
                         opportunities_found += 1
                         
                         # Just evaluate and log opportunities without executing trades
-                        if self.evaluate_opportunity(market_data):
+                        if self.evaluate_opportunity(market_data, opportunities):
                             print("Found good trading opportunity!")
                             print(f"Want: {market_data.i_want}")
                             print(f"Have: {market_data.i_have}")
@@ -479,14 +658,51 @@ class TradingBot:
                 print(f"Error scanning pair: {e}")
                 failed_scans += 1
                 
-            # Print progress
-            print(f"\nProgress: {len(scanned_pairs)}/{total_pairs} pairs")
-            print(f"Successful scans: {successful_scans}")
-            print(f"Failed scans: {failed_scans}")
-            print(f"Opportunities found: {opportunities_found}")
+            # Print progress as one record
+            logger.info(
+                "\nProgress: %d/%d pairs\nSuccessful scans: %d\nFailed scans: %d\nOpportunities found: %d",
+                scanned, total_pairs, successful_scans, failed_scans, opportunities_found
+            )
+        
+        # Initialize current selections to None to force the first clicks
+        current_i_want = None
+        current_i_have = None
+        
+        from .utils.market_gemini import analyze_market_screenshot
+        
+        # All results go to one append-only JSON Lines file per scan, unbuffered
+        # so every record written survives an interrupted or killed scan
+        results_file = open(output_dir / f"scan_{datetime.now():%Y%m%d_%H%M%S}.jsonl", "wb", buffering=0)
+        try:
+            for i, (i_want, i_have) in enumerate(ordered_pairs, 1):
+                print(f"\nScanning pair {i}/{total_pairs}: {i_want} -> {i_have}")
+                scanned += 1
+            
+                analysis = None
+                try:
+                    # Capture market data, analysis continues in the background
+                    image_path = self.capture_market(i_want, i_have, current_i_want, current_i_have)
+                    current_i_want, current_i_have = i_want, i_have  # Update selections after scan
+                    if image_path is not None:
+                        analysis = self.analyzer_pool.submit(analyze_market_screenshot, image_path)
+                    else:
+                        print("No market screenshot captured")
+                except Exception as e:
+                    print(f"Error scanning market: {e}")
+                pending.append((i_want, i_have, analysis))
+            
+                # Keep up to analysis_depth analyses in flight behind the playback,
+                # collecting the oldest first so results are written in scan order
+                while len(pending) > self.analysis_depth:
+                    finish_scan(*pending.popleft())
+                
+            while pending:
+                finish_scan(*pending.popleft())
+        finally:
+            results_file.close()
             
         print(f"\nMarket scan complete!")
-        print(f"Total pairs scanned: {len(scanned_pairs)}/{total_pairs}")
+        print(f"Total pairs scanned: {scanned}/{total_pairs}")
         print(f"Successful scans: {successful_scans}")
         print(f"Failed scans: {failed_scans}")
         print(f"Opportunities found: {opportunities_found}")
@@ -2,4 +2,11 @@
 Screen capture and automation utilities for POE2 trading
 """
 
-from .screen_capture import ScreenCapture
+__all__ = ["ScreenCapture"]
+
+def __getattr__(name):
+    # ScreenCapture pulls in OpenCV and pyautogui, so load it only when asked for
+    if name == "ScreenCapture":
+        from .screen_capture import ScreenCapture
+        return ScreenCapture
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,23 @@
-import json
-import pyautogui
+import hashlib
+import importlib.util
+import logging
+import orjson
+import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Literal, Set, Optional
-import pytesseract
-from PIL import Image
-import io
+from typing import List, Dict, Literal, Set, Optional, Tuple, TYPE_CHECKING
+
+# GUI automation and OCR packages are heavy to import, so they are imported
+# where they are used and modules only needing the data maps stay cheap
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Per-click playback messages are DEBUG, so formatting them is skipped unless enabled
+logger = logging.getLogger(__name__)
 
 # Valid sequence types
 SequenceType = Literal["select", "amount", "trade", "market"]
@@ -16,6 +28,12 @@ SEQUENCE_TYPES = {
     "market": "Position for checking market prices (moves to position, holds cmd, captures text)"
 }
 
+VALID_SEQUENCE_TYPES = frozenset(SEQUENCE_TYPES)
+
+# Sequence type listings are static, so they are rendered once
+SEQUENCE_TYPE_NAMES = ", ".join(SEQUENCE_TYPES)
+SEQUENCE_TYPES_MENU = "\n".join(f"- {seq_type}: {desc}" for seq_type, desc in SEQUENCE_TYPES.items())
+
 # Fixed position prefixes
 FIXED_PREFIXES = {
     "i_want": [{"x": 700, "y": 240}],  # Fixed position for "I want" tab
@@ -41,6 +59,16 @@ I_HAVE_CATEGORY_POSITIONS = {
     for category, pos in I_WANT_CATEGORY_POSITIONS.items()
 }
 
+def split_sequence_name(name: str) -> Tuple[str, Optional[bool]]:
+    """Split a sequence name into (item name, is_want), is_want is None without a side prefix"""
+    item_name = name.removeprefix("i_want_")
+    if item_name != name:
+        return item_name, True
+    item_name = name.removeprefix("i_have_")
+    if item_name != name:
+        return item_name, False
+    return name, None
+
 # Fixed category order
 CATEGORY_ORDER = [
     "currency",
@@ -54,16 +82,33 @@ CATEGORY_ORDER = [
     "soul_cores"
 ]
 
+@lru_cache(maxsize=1)
+def read_tradeables_file() -> Dict:
+    """Parse data/tradeables.json once for every loader in this module ({} when missing)"""
+    try:
+        return orjson.loads(Path("data/tradeables.json").read_bytes())
+    except FileNotFoundError:
+        return {}
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory if it is missing, also when it was removed mid-run"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file through a temporary file so a crash never leaves it half written"""
+    ensure_dir(path.parent)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
 def load_item_categories() -> Dict[str, str]:
     """Load item to category mappings from tradeables.json"""
-    tradeable_file = Path("data/tradeables.json")
-    if not tradeable_file.exists():
+    data = read_tradeables_file()
+    if not data:
         print("Warning: tradeables.json not found")
         return {}
         
-    with open(tradeable_file) as f:
-        data = json.load(f)
-        
     item_categories = {}
     
     # Process each top-level category
@@ -84,14 +129,26 @@ def load_item_categories() -> Dict[str, str]:
 
 ITEM_CATEGORIES = load_item_categories()
 
+@lru_cache(maxsize=1)
+def load_category_items() -> Dict[str, Tuple[str, ...]]:
+    """Get the sorted items of each top-level category in tradeables.json"""
+    category_items = {}
+    for category, items in read_tradeables_file().items():
+        if isinstance(items, dict):  # Flatten nested subcategories
+            items = [item for subitems in items.values() if isinstance(subitems, list) for item in subitems]
+        category_items[category] = tuple(sorted(items)) if isinstance(items, list) else ()
+    return category_items
+
+@lru_cache(maxsize=1)
+def load_all_category_items() -> Tuple[str, ...]:
+    """Get the items of every tradeables.json category as one sorted tuple"""
+    return tuple(sorted(item for items in load_category_items().values() for item in items))
+
+@lru_cache(maxsize=None)
 def get_category_for_item(item_name: str) -> str:
-    """Get the category for an item based on its name"""
+    """Get the category for an item based on its name (cached, ITEM_CATEGORIES is fixed at import)"""
     # Remove i_want_ or i_have_ prefix if present
-    clean_name = item_name
-    if clean_name.startswith("i_want_"):
-        clean_name = clean_name[7:]
-    elif clean_name.startswith("i_have_"):
-        clean_name = clean_name[7:]
+    clean_name, _ = split_sequence_name(item_name)
 
     # Try direct lookup
     if clean_name in ITEM_CATEGORIES:
@@ -115,14 +172,11 @@ def get_clicks_for_category(category: str, is_want: bool = True) -> List[Dict[st
 
 def load_tradeables() -> Set[str]:
     """Load all tradeable items from tradeables.json"""
-    tradeable_file = Path("data/tradeables.json")
-    if not tradeable_file.exists():
+    data = read_tradeables_file()
+    if not data:
         print("Warning: tradeables.json not found")
         return set()
         
-    with open(tradeable_file) as f:
-        data = json.load(f)
-        
     tradeables = set()
     
     # Process each category
@@ -142,8 +196,101 @@ def load_tradeables() -> Set[str]:
     
     return tradeables
 
-def capture_market_info(x: int, y: int, item_name: str = "", region: Dict[str, int] = None) -> str:
-    """Capture and process market information from screen"""
+# Turns a tradeable name into its sequence identifier in one pass
+CLEAN_NAME_TABLE = str.maketrans({" ": "_", "'": None})
+
+@lru_cache(maxsize=1)
+def load_clean_tradeables() -> Tuple[Tuple[str, str], ...]:
+    """Get the (item, clean name) pairs of all tradeables, sorted by item"""
+    return tuple((item, item.lower().translate(CLEAN_NAME_TABLE)) for item in sorted(load_tradeables()))
+
+# OCR text of recent captures by image digest: digest -> (time.monotonic() of the OCR, text)
+OCR_CACHE: Dict[str, Tuple[float, str]] = {}
+OCR_CACHE_TTL = 60.0  # Seconds an OCR result may be reused for an identical capture
+
+OCR_THREAD_STATE = threading.local()  # Tesseract APIs are not reentrant, so each thread gets its own
+
+# Market info is one block of prices and names, so treat it as a single text
+# block and skip the word dictionaries, which only slow down number recognition
+OCR_PAGE_SEG_MODE = 6
+OCR_VARIABLES = {"load_system_dawg": "0", "load_freq_dawg": "0"}
+OCR_CONFIG = f"--psm {OCR_PAGE_SEG_MODE} " + " ".join(f"-c {name}={value}" for name, value in OCR_VARIABLES.items())
+
+def ocr_cache_key(screenshot: "Image.Image") -> str:
+    """OCR cache key of a raw capture"""
+    return hashlib.blake2b(screenshot.tobytes(), digest_size=16).hexdigest()
+
+def expire_ocr_cache(now: float):
+    """Drop expired entries so the cache only holds the recent captures"""
+    for expired in [k for k, (ocr_time, _) in OCR_CACHE.items() if now - ocr_time >= OCR_CACHE_TTL]:
+        del OCR_CACHE[expired]
+
+@lru_cache(maxsize=1)
+def has_tesserocr() -> bool:
+    """Check once whether the in-process Tesseract binding is installed, without creating an API"""
+    return importlib.util.find_spec("tesserocr") is not None
+
+def get_ocr_api():
+    """Get this thread's in-process Tesseract API, or None when tesserocr is not installed"""
+    if not hasattr(OCR_THREAD_STATE, "api"):
+        try:
+            # Optional in-process Tesseract binding, avoids a subprocess per OCR call
+            from tesserocr import PyTessBaseAPI
+            OCR_THREAD_STATE.api = PyTessBaseAPI(psm=OCR_PAGE_SEG_MODE, variables=OCR_VARIABLES)
+        except ImportError:
+            OCR_THREAD_STATE.api = None
+    return OCR_THREAD_STATE.api
+
+@lru_cache(maxsize=1)
+def get_ocr_tile_pool() -> ThreadPoolExecutor:
+    """Pool that OCRs pages in parallel with the in-process API, started on first use"""
+    return ThreadPoolExecutor(max_workers=2)
+
+def ocr_image(image: "Image.Image") -> str:
+    """Read one prepared image with this thread's in-process Tesseract API"""
+    ocr_api = get_ocr_api()
+    ocr_api.SetImage(image)
+    return ocr_api.GetUTF8Text()
+
+def binarize_for_ocr(screenshot: "Image.Image") -> "Image.Image":
+    """Convert a screenshot to black and white around its mean brightness for OCR"""
+    import numpy as np
+    from PIL import Image
+    gray = np.asarray(screenshot.convert("L"))
+    return Image.fromarray(np.where(gray > gray.mean(), 255, 0).astype(np.uint8))
+
+def tile_for_ocr(image: "Image.Image") -> List["Image.Image"]:
+    """Cut an image taller than 4:3 of its width into tiles, top to bottom
+    
+    Tesseract does worse on tall images than on several shorter ones.
+    """
+    width, height = image.size
+    tile_height = max(1, width * 4 // 3)
+    if height <= tile_height:
+        return [image]
+    return [image.crop((0, top, width, min(top + tile_height, height))) for top in range(0, height, tile_height)]
+
+SCREEN_GRAB_STATE = threading.local()  # mss handles are bound to the thread that created them
+
+def grab_screen_region(left: int, top: int, width: int, height: int) -> "Image.Image":
+    """Grab a screen region as an RGB image through this thread's mss handle
+    
+    The handle is reused so repeated captures skip setting up the native
+    capture buffers that pyautogui.screenshot recreates on every call.
+    """
+    from PIL import Image
+    if not hasattr(SCREEN_GRAB_STATE, "sct"):
+        import mss
+        SCREEN_GRAB_STATE.sct = mss.mss()
+    raw = SCREEN_GRAB_STATE.sct.grab({"left": left, "top": top, "width": width, "height": height})
+    return Image.frombytes("RGB", raw.size, raw.rgb)
+
+def capture_market_screenshot(x: int, y: int, item_name: str = "", region: Dict[str, int] = None) -> Tuple["Image.Image", Path]:
+    """Capture the market information region in memory
+    
+    Returns the image and the path it should be saved under; writing it is
+    left to the caller, see save_screenshot_async.
+    """
     # Use provided region or default to centered region
     if region:
         screenshot_region = (
@@ -158,29 +305,175 @@ def capture_market_info(x: int, y: int, item_name: str = "", region: Dict[str, i
         screenshot_region = (x - width//2, y - height//2, width, height)
     
     # Create screenshots directory if it doesn't exist
-    screenshot_dir = Path("data/market_screenshots")
-    screenshot_dir.mkdir(parents=True, exist_ok=True)
+    screenshot_dir = ensure_dir(Path("data/market_screenshots"))
     
     # Generate timestamp
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     
     # Capture the screen region
-    screenshot = pyautogui.screenshot(region=screenshot_region)
+    screenshot = grab_screen_region(*screenshot_region)
     
-    # Save the screenshot with timestamp and item name
+    # Name the screenshot with timestamp and item name
     filename = f"{timestamp}_{item_name}_market.png" if item_name else f"{timestamp}_market.png"
-    screenshot.save(screenshot_dir / filename)
-    print(f"Screenshot saved as: {filename}")
+    return screenshot, screenshot_dir / filename
+
+def ocr_pages(pages: List["Image.Image"]) -> List[str]:
+    """OCR prepared images with the in-process Tesseract API when available
+    
+    Otherwise the images are read in a single Tesseract run through an image
+    list file.
+    """
+    if not pages:
+        return []
+    if has_tesserocr():
+        # Each pool thread reads with its own API
+        return [text.strip() for text in get_ocr_tile_pool().map(ocr_image, pages)]
+        
+    import pytesseract
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_paths = [Path(tmp_dir) / f"page_{i}.png" for i in range(len(pages))]
+        for page, page_path in zip(pages, page_paths):
+            page.save(page_path, compress_level=SCREENSHOT_COMPRESS_LEVEL)
+        image_list = Path(tmp_dir) / "pages.txt"
+        image_list.write_text("\n".join(map(str, page_paths)))
+        text = pytesseract.image_to_string(str(image_list), config=OCR_CONFIG)
+        
+    # Tesseract separates the pages of a multi-image run with form feeds
+    texts = text.split("\f")
+    return [page.strip() for page in texts[:len(pages)]] + [""] * (len(pages) - len(texts))
+
+def ocr_batch(screenshots: List["Image.Image"]) -> List[str]:
+    """OCR in-memory captures, reusing the text of identical captures made within OCR_CACHE_TTL
+    
+    New captures are binarized and tiled, and all of their tiles are read
+    in a single Tesseract run.
+    """
+    now = time.monotonic()
+    expire_ocr_cache(now)
+    keys = []
+    new_tiles: Dict[str, List["Image.Image"]] = {}
+    for screenshot in screenshots:
+        key = ocr_cache_key(screenshot)
+        keys.append(key)
+        if key not in OCR_CACHE and key not in new_tiles:
+            new_tiles[key] = tile_for_ocr(binarize_for_ocr(screenshot))
+                
+    # Every tile is its own page, joined back per screenshot in order
+    pages = iter(ocr_pages([tile for tiles in new_tiles.values() for tile in tiles]))
+    for key, tiles in new_tiles.items():
+        OCR_CACHE[key] = (now, "\n".join(next(pages) for _ in tiles))
+    return [OCR_CACHE[key][1] for key in keys]
+
+# Screenshot PNGs are written on this worker so zlib never blocks the UI path
+SCREENSHOT_WRITER = ThreadPoolExecutor(max_workers=1)
+SCREENSHOT_COMPRESS_LEVEL = 1  # Fast lossless PNG compression
+
+def save_screenshot_async(screenshot: "Image.Image", path: Path) -> Future:
+    """Write a screenshot PNG on the background writer"""
+    return SCREENSHOT_WRITER.submit(screenshot.save, path, compress_level=SCREENSHOT_COMPRESS_LEVEL)
+
+YES_ANSWERS = frozenset({"y", "yes"})
+
+# Sides (is_want values) selected by a want/have/both answer
+SIDE_CHOICES = {"want": (True,), "have": (False,), "both": (True, False)}
+
+def confirm(prompt: str = "") -> bool:
+    """Ask a y/n question, anything but y/yes is a no"""
+    return input(prompt).strip().lower() in YES_ANSWERS
+
+# Keys ending a position wait, by platform key code
+WIN32_KEY_DOWN = frozenset({0x0100, 0x0104})  # WM_KEYDOWN, WM_SYSKEYDOWN
+WIN32_END_KEYS = {0x0D: "enter", 0x51: "q"}  # VK_RETURN, VK_Q
+DARWIN_END_KEYS = {36: "enter", 12: "q"}  # kVK_Return, kVK_ANSI_Q
+TERMINAL_SETTLE = 0.05  # Seconds for the terminal to receive a key the hook has already seen
+
+def flush_terminal_input():
+    """Drop keys that reached the terminal while the global hook was listening
     
-    # Use OCR to extract text
-    text = pytesseract.image_to_string(screenshot)
-    return text
+    Otherwise a leftover newline answers the next confirm() with "no", and a
+    leftover q is prefixed to the next menu choice.
+    """
+    if not sys.stdin.isatty():
+        return
+    time.sleep(TERMINAL_SETTLE)
+    try:
+        import termios
+    except ImportError:  # Windows
+        import msvcrt
+        while msvcrt.kbhit():
+            msvcrt.getwch()
+    else:
+        termios.tcflush(sys.stdin, termios.TCIFLUSH)
+
+def wait_for_position():
+    """Wait for Enter (returns the mouse position) or q (returns None)
+    
+    Keys are read through a global hook, so positions can be recorded while
+    the game window has focus. On Windows and macOS the Enter or q press is
+    kept from the focused window (so Enter does not open the game chat), other
+    keys pass through. Raises pyautogui.FailSafeException when the mouse is in
+    a fail-safe corner, like pyautogui.position() callers expect.
+    """
+    import pyautogui
+    from pynput import keyboard, mouse
+    pressed = []
+    
+    def end_wait(key: str):
+        pressed.append(key)
+        listener.stop()
+        
+    def on_press(key):
+        if key == keyboard.Key.enter:
+            end_wait("enter")
+        elif getattr(key, "char", None) == "q":
+            end_wait("q")
+            
+    def win32_event_filter(msg, data):
+        key = WIN32_END_KEYS.get(data.vkCode)
+        if key and msg in WIN32_KEY_DOWN:
+            end_wait(key)
+            listener.suppress_event()
+            
+    def darwin_intercept(event_type, event):
+        import Quartz
+        if event_type == Quartz.kCGEventKeyDown:
+            key = DARWIN_END_KEYS.get(Quartz.CGEventGetIntegerValueField(event, Quartz.kCGKeyboardEventKeycode))
+            if key:
+                end_wait(key)
+                return None  # Suppressed
+        return event
+        
+    # Filters for other platforms are ignored by pynput; X11 cannot suppress
+    # single keys, so the terminal input is flushed below in any case
+    listener = keyboard.Listener(
+        on_press=on_press,
+        win32_event_filter=win32_event_filter,
+        darwin_intercept=darwin_intercept
+    )
+    with listener:
+        listener.join()
+    flush_terminal_input()
+    if not pressed or pressed[0] != "enter":
+        return None
+        
+    x, y = mouse.Controller().position
+    pos = pyautogui.Point(int(x), int(y))
+    if pyautogui.FAILSAFE and tuple(pos) in pyautogui.FAILSAFE_POINTS:
+        raise pyautogui.FailSafeException("Mouse moved to a fail-safe corner")
+    return pos
 
 class ClickRecorder:
     def __init__(self):
+        import pyautogui
         self.sequences: Dict[str, Dict[str, List[Dict[str, int]]]] = {}
+        # Side sequence names of each item: clean item name -> {is_want: sequence name}
+        self.item_index: Dict[str, Dict[bool, str]] = {}
         self.data_file = Path("data/click_sequences.json")
         self.prefix_file = Path("data/prefix_sequences.json")
+        self.last_capture: Optional["Image.Image"] = None  # In-memory image taken by the last market sequence
+        self.last_screenshot: Optional[Path] = None  # Where last_capture is saved
+        self.screenshot_saved: Optional[Future] = None  # Pending write of last_screenshot, None when not saved
+        self.save_screenshots = True  # Write market captures to disk, bot scans analyze them from there
         pyautogui.PAUSE = 0.1  # Add small delay between actions
         pyautogui.FAILSAFE = True  # Move mouse to corner to abort
         self.load_sequences()
@@ -188,37 +481,88 @@ class ClickRecorder:
 
     def load_sequences(self):
         """Load saved click sequences"""
-        if self.data_file.exists():
-            with open(self.data_file) as f:
-                self.sequences = json.load(f)
+        try:
+            self.sequences = orjson.loads(self.data_file.read_bytes())
+        except FileNotFoundError:
+            pass
+        self.item_index = {}
+        for item_name in self.sequences:
+            self.index_sequence(item_name)
 
     def save_sequences(self):
         """Save click sequences to file"""
-        self.data_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.data_file, 'w') as f:
-            json.dump(self.sequences, f, indent=2)
+        write_atomic(self.data_file, orjson.dumps(self.sequences, option=orjson.OPT_INDENT_2))
+
+    def wait_for_screenshot(self, timeout: Optional[float] = None) -> Optional[Path]:
+        """Wait until the last market screenshot is written and return its path, None when it was not saved"""
+        if self.screenshot_saved is None:
+            return None
+        self.screenshot_saved.result(timeout)
+        return self.last_screenshot
+        
+    def missing_sequences(self, required: Dict[str, str]) -> Dict[str, str]:
+        """Return the (item_name -> sequence_type) entries that have not been recorded"""
+        return {
+            item_name: sequence_type
+            for item_name, sequence_type in required.items()
+            if sequence_type not in self.sequences.get(item_name, {})
+        }
+
+    def index_sequence(self, item_name: str):
+        """Add a sequence name to item_index if it is an i_want_/i_have_ sequence"""
+        clean_name, is_want = split_sequence_name(item_name)
+        if is_want is not None:
+            self.item_index.setdefault(clean_name, {})[is_want] = item_name
+            
+    def unindex_sequence(self, item_name: str):
+        """Remove a deleted sequence name from item_index"""
+        clean_name, is_want = split_sequence_name(item_name)
+        sides = self.item_index.get(clean_name)
+        if sides is not None:
+            sides.pop(is_want, None)
+            if not sides:
+                del self.item_index[clean_name]
+                
+    def set_item_position(self, clean_name: str, click: Dict[str, int]):
+        """Use one item position as both the i_want and i_have select sequence"""
+        for is_want, prefix in ((True, "i_want_"), (False, "i_have_")):
+            item_name = prefix + clean_name
+            self.sequences[item_name] = {"select": [click]}
+            self.item_index.setdefault(clean_name, {})[is_want] = item_name
+
+    def sequences_by_category(self) -> Dict[Tuple[bool, str], List[str]]:
+        """Index the sorted i_want_/i_have_ sequence names by (is_want, category)"""
+        index: Dict[Tuple[bool, str], List[str]] = {}
+        for clean_name in sorted(self.item_index):
+            category = get_category_for_item(clean_name)
+            for is_want, item_name in self.item_index[clean_name].items():
+                index.setdefault((is_want, category), []).append(item_name)
+        return index
 
     def load_prefixes(self):
         """Load prefix sequences"""
         self.prefixes = {}
-        if self.prefix_file.exists():
-            with open(self.prefix_file) as f:
-                self.prefixes = json.load(f)
+        try:
+            self.prefixes = orjson.loads(self.prefix_file.read_bytes())
+        except FileNotFoundError:
+            pass
 
     def save_prefixes(self):
         """Save prefix sequences"""
-        self.prefix_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.prefix_file, 'w') as f:
-            json.dump(self.prefixes, f, indent=2)
+        write_atomic(self.prefix_file, orjson.dumps(self.prefixes, option=orjson.OPT_INDENT_2))
 
     def delete_all_sequences(self):
         """Delete all recorded sequences"""
         self.sequences = {}
+        self.item_index = {}
         self.save_sequences()
         print("All sequences deleted")
         
-    def delete_sequence(self, item_name: str, sequence_type: str = None):
-        """Delete a specific sequence or all sequences for an item"""
+    def delete_sequence(self, item_name: str, sequence_type: str = None, save: bool = True):
+        """Delete a specific sequence or all sequences for an item
+        
+        With save=False the caller saves once after a batch of deletions.
+        """
         if item_name not in self.sequences:
             print(f"No sequences found for {item_name}")
             return False
@@ -228,7 +572,9 @@ class ClickRecorder:
                 del self.sequences[item_name][sequence_type]
                 if not self.sequences[item_name]:  # If no sequences left for item
                     del self.sequences[item_name]
-                self.save_sequences()
+                    self.unindex_sequence(item_name)
+                if save:
+                    self.save_sequences()
                 print(f"Deleted {sequence_type} sequence for {item_name}")
                 return True
             else:
@@ -236,12 +582,15 @@ class ClickRecorder:
                 return False
         else:
             del self.sequences[item_name]
-            self.save_sequences()
+            self.unindex_sequence(item_name)
+            if save:
+                self.save_sequences()
             print(f"Deleted all sequences for {item_name}")
             return True
 
     def record_prefix(self, prefix_name: str):
         """Record a prefix sequence of clicks"""
+        import pyautogui
         print(f"\nRecording prefix sequence: {prefix_name}")
         print("Record the common clicks that should happen before item-specific clicks")
         print("\nCommands:")
@@ -254,12 +603,10 @@ class ClickRecorder:
         
         try:
             while True:
-                command = input()
-                
-                if command.lower() == 'q':
+                pos = wait_for_position()
+                if pos is None:
                     break
                     
-                pos = pyautogui.position()
                 clicks.append({"x": pos.x, "y": pos.y})
                 print(f"Recorded position at ({pos.x}, {pos.y})")
                 
@@ -279,8 +626,9 @@ class ClickRecorder:
 
     def record_sequence(self, item_name: str, sequence_type: str = "select"):
         """Record a sequence of clicks for an item"""
-        if sequence_type not in SEQUENCE_TYPES:
-            print(f"Invalid sequence type. Valid types are: {', '.join(SEQUENCE_TYPES.keys())}")
+        import pyautogui
+        if sequence_type not in VALID_SEQUENCE_TYPES:
+            print(f"Invalid sequence type. Valid types are: {SEQUENCE_TYPE_NAMES}")
             return False
             
         print(f"\nRecording clicks for {item_name} ({sequence_type})")
@@ -296,23 +644,17 @@ class ClickRecorder:
             
             try:
                 # Get top-left corner
-                while True:
-                    command = input()
-                    if command.lower() == 'q':
-                        return False
-                    pos1 = pyautogui.position()
-                    print(f"Top-left corner: ({pos1.x}, {pos1.y})")
-                    break
+                pos1 = wait_for_position()
+                if pos1 is None:
+                    return False
+                print(f"Top-left corner: ({pos1.x}, {pos1.y})")
                 
                 print("\nNow move to bottom-right corner and press Enter")
                 # Get bottom-right corner
-                while True:
-                    command = input()
-                    if command.lower() == 'q':
-                        return False
-                    pos2 = pyautogui.position()
-                    print(f"Bottom-right corner: ({pos2.x}, {pos2.y})")
-                    break
+                pos2 = wait_for_position()
+                if pos2 is None:
+                    return False
+                print(f"Bottom-right corner: ({pos2.x}, {pos2.y})")
                 
                 capture_region = {
                     "x1": min(pos1.x, pos2.x),
@@ -340,12 +682,10 @@ class ClickRecorder:
         
         try:
             while True:
-                command = input()
-                
-                if command.lower() == 'q':
+                pos = wait_for_position()
+                if pos is None:
                     break
                     
-                pos = pyautogui.position()
                 click_data = {"x": pos.x, "y": pos.y}
                 
                 if sequence_type == "market":
@@ -367,16 +707,24 @@ class ClickRecorder:
 
         if item_name not in self.sequences:
             self.sequences[item_name] = {}
+            self.index_sequence(item_name)
         self.sequences[item_name][sequence_type] = clicks
         self.save_sequences()
         
         print(f"\nRecorded {len(clicks)} positions")
         return True
 
-    def play_sequence(self, item_name: str, sequence_type: str = "select", current_i_want: Optional[str] = None, amount: Optional[str] = None):
+    def play_sequences(self, item_names: List[str], sequence_type: str = "select", **kwargs) -> bool:
+        """Play back several recorded sequences, switching to the game window only once"""
+        played = True
+        for i, item_name in enumerate(item_names):
+            played = self.play_sequence(item_name, sequence_type, switch_window=(i == 0), **kwargs) and played
+        return played
+        
+    def play_sequence(self, item_name: str, sequence_type: str = "select", current_i_want: Optional[str] = None, amount: Optional[str] = None, switch_window: bool = True):
         """Play back a recorded sequence"""
-        if sequence_type not in SEQUENCE_TYPES:
-            print(f"Invalid sequence type. Valid types are: {', '.join(SEQUENCE_TYPES.keys())}")
+        if sequence_type not in VALID_SEQUENCE_TYPES:
+            print(f"Invalid sequence type. Valid types are: {SEQUENCE_TYPE_NAMES}")
             return False
             
         if item_name not in self.sequences or sequence_type not in self.sequences[item_name]:
@@ -385,132 +733,139 @@ class ClickRecorder:
 
         sequence = self.sequences[item_name][sequence_type]
         
-        # For amount sequences, use the provided amount
-        if sequence_type == "amount":
-            if amount is None:
-                print("Error: amount parameter is required for amount sequences")
-                return False
-            
-            print("\nSwitch to POE window...")
-            time.sleep(0.5)  # Give time to switch windows
+        if sequence_type == "amount" and amount is None:
+            print("Error: amount parameter is required for amount sequences")
+            return False
             
-            for click in sequence:
-                # 1. Click the input field
-                pyautogui.moveTo(click["x"], click["y"])
-                time.sleep(0.1)  # Delay before click
-                pyautogui.click()
-                time.sleep(0.1)  # Delay after click
-                
-                # 2. Select all text (Command+A)
-                pyautogui.hotkey('command', 'a')
-                time.sleep(0.1)  # Delay after select all
-                
-                # 3. Press backspace to delete
-                pyautogui.press('backspace')
-                time.sleep(0.1)  # Delay after delete
-                
-                # 4. Type the new amount
-                pyautogui.write(str(amount))
-                time.sleep(0.1)  # Delay after typing
-        elif sequence_type == "market":
+        # Batched playback is already in the game window after the first sequence
+        if switch_window:
             print("\nSwitch to POE window...")
             time.sleep(0.5)  # Give time to switch windows
-            
-            # Move to position and capture market info
-            tradeable_click = sequence[0]  # Only one position recorded - the tradeable
-            print(f"Moving to position ({tradeable_click['x']}, {tradeable_click['y']})")
-            pyautogui.moveTo(tradeable_click["x"], tradeable_click["y"])
-            time.sleep(0.1)  # Delay before capture
-            
-            # Hold command key and capture
-            for _ in range(3):  # Try up to 3 times to ensure key is pressed
-                pyautogui.keyDown('command')
-                time.sleep(0.1)  # Small delay to ensure key is registered
-            
+        
+        self.SEQUENCE_PLAYERS[sequence_type](self, item_name, sequence, current_i_want, amount)
+        return True
+
+    def play_amount(self, item_name: str, sequence: List[Dict[str, int]], current_i_want: Optional[str], amount: Optional[str]):
+        """Replace the text of the amount field(s) with amount"""
+        import pyautogui
+        # pyautogui.PAUSE already waits after each call, so no extra sleeps here
+        for click in sequence:
+            # 1. Click the input field
+            pyautogui.moveTo(click["x"], click["y"])
+            pyautogui.click()
+
+            # 2. Select all text (Command+A)
+            pyautogui.hotkey('command', 'a')
+
+            # 3. Press backspace to delete
+            pyautogui.press('backspace')
+
+            # 4. Type the new amount
+            pyautogui.write(str(amount), interval=0)
+
+    def play_market(self, item_name: str, sequence: List[Dict[str, int]], current_i_want: Optional[str], amount: Optional[str]):
+        """Show the market info of the tradeable and capture it in the background"""
+        import pyautogui
+        # Move to position and capture market info
+        tradeable_click = sequence[0]  # Only one position recorded - the tradeable
+        logger.debug("Moving to position (%d, %d)", tradeable_click["x"], tradeable_click["y"])
+        pyautogui.moveTo(tradeable_click["x"], tradeable_click["y"])
+        time.sleep(0.1)  # Delay before capture
+
+        # Hold command key and capture, hold() sends exactly one keyDown
+        # and always releases the key, even if the capture fails
+        with pyautogui.hold('command'):
             time.sleep(0.5)  # Wait for market info to appear
-            
-            # Capture and analyze market info
-            market_text = capture_market_info(
+
+            # Capture market info, the screenshot is analyzed by the caller so
+            # there is no OCR here, and the PNG is encoded after the key is released
+            self.last_capture, self.last_screenshot = capture_market_screenshot(
                 tradeable_click["x"], 
                 tradeable_click["y"], 
                 item_name, 
                 tradeable_click.get("region", None)
             )
-            
-            # Release command key (multiple times to ensure it's released)
-            for _ in range(3):
-                pyautogui.keyUp('command')
-                time.sleep(0.1)
-        elif sequence_type == "trade":
-            print("\nSwitch to POE window...")
-            time.sleep(0.5)  # Give time to switch windows
-            
-            # Simply move to position and click
-            for click in sequence:
-                print(f"Clicking trade button at ({click['x']}, {click['y']})")
-                pyautogui.moveTo(click["x"], click["y"])
-                time.sleep(0.1)  # Delay before click
-                pyautogui.click()
-                time.sleep(0.1)  # Delay after click
+        if self.save_screenshots:
+            self.screenshot_saved = save_screenshot_async(self.last_capture, self.last_screenshot)
+            logger.debug("Saving screenshot as: %s", self.last_screenshot.name)
         else:
-            print("\nSwitch to POE window...")
-            time.sleep(0.5)  # Give time to switch windows
-            
-            # Determine if this is i_want or i_have
-            is_want = item_name.startswith("i_want_")
-            clean_name = item_name[7:]  # Remove i_want_ or i_have_ prefix
-            
-            # For i_want sequences, check if we need to change the tab and category
-            if is_want:
-                if current_i_want is None or current_i_want != clean_name:
-                    # Click the i_want tab
-                    tab_pos = FIXED_PREFIXES["i_want"][0]
-                    print(f"Clicking i_want tab at ({tab_pos['x']}, {tab_pos['y']})")
-                    pyautogui.moveTo(tab_pos["x"], tab_pos["y"])
-                    time.sleep(0.1)  # Delay before click
-                    pyautogui.click()
-                    time.sleep(0.1)  # Delay after click
-                    
-                    # Click the category
-                    category = get_category_for_item(clean_name)
-                    category_pos = I_WANT_CATEGORY_POSITIONS[category]
-                    print(f"Clicking {category} category at ({category_pos['x']}, {category_pos['y']})")
-                    pyautogui.moveTo(category_pos["x"], category_pos["y"])
-                    time.sleep(0.1)  # Delay before click
-                    pyautogui.click()
-                    time.sleep(0.1)  # Delay after click
-                else:
-                    print(f"Keeping current i_want {clean_name}...")
-            else:
-                # Always click i_have tab and category
-                tab_pos = FIXED_PREFIXES["i_have"][0]
-                print(f"Clicking i_have tab at ({tab_pos['x']}, {tab_pos['y']})")
+            self.screenshot_saved = None
+
+    def play_trade(self, item_name: str, sequence: List[Dict[str, int]], current_i_want: Optional[str], amount: Optional[str]):
+        """Click the trade button"""
+        import pyautogui
+        # Simply move to position and click
+        for click in sequence:
+            logger.debug("Clicking trade button at (%d, %d)", click["x"], click["y"])
+            pyautogui.moveTo(click["x"], click["y"])
+            time.sleep(0.1)  # Delay before click
+            pyautogui.click()
+            time.sleep(0.1)  # Delay after click
+
+    def play_select(self, item_name: str, sequence: List[Dict[str, int]], current_i_want: Optional[str], amount: Optional[str]):
+        """Select the item on its tab and category, the i_want tab is skipped when already selected"""
+        import pyautogui
+        # Determine if this is i_want or i_have
+        clean_name, is_want = split_sequence_name(item_name)
+
+        # For i_want sequences, check if we need to change the tab and category
+        if is_want:
+            if current_i_want is None or current_i_want != clean_name:
+                # Click the i_want tab
+                tab_pos = FIXED_PREFIXES["i_want"][0]
+                logger.debug("Clicking i_want tab at (%d, %d)", tab_pos["x"], tab_pos["y"])
                 pyautogui.moveTo(tab_pos["x"], tab_pos["y"])
                 time.sleep(0.1)  # Delay before click
                 pyautogui.click()
                 time.sleep(0.1)  # Delay after click
-                
+
                 # Click the category
                 category = get_category_for_item(clean_name)
-                category_pos = I_HAVE_CATEGORY_POSITIONS[category]  # Use I_HAVE_CATEGORY_POSITIONS here
-                print(f"Clicking {category} category at ({category_pos['x']}, {category_pos['y']})")
+                category_pos = I_WANT_CATEGORY_POSITIONS[category]
+                logger.debug("Clicking %s category at (%d, %d)", category, category_pos["x"], category_pos["y"])
                 pyautogui.moveTo(category_pos["x"], category_pos["y"])
                 time.sleep(0.1)  # Delay before click
                 pyautogui.click()
                 time.sleep(0.1)  # Delay after click
-            
-            # Click the item position
-            for click in sequence:
-                print(f"Clicking item at ({click['x']}, {click['y']})")
-                pyautogui.moveTo(click["x"], click["y"])
-                time.sleep(0.1)  # Delay before click
-                pyautogui.click()
-                time.sleep(0.1)  # Delay after click
-        
-        return True
+            else:
+                logger.debug("Keeping current i_want %s...", clean_name)
+        else:
+            # Always click i_have tab and category
+            tab_pos = FIXED_PREFIXES["i_have"][0]
+            logger.debug("Clicking i_have tab at (%d, %d)", tab_pos["x"], tab_pos["y"])
+            pyautogui.moveTo(tab_pos["x"], tab_pos["y"])
+            time.sleep(0.1)  # Delay before click
+            pyautogui.click()
+            time.sleep(0.1)  # Delay after click
+
+            # Click the category
+            category = get_category_for_item(clean_name)
+            category_pos = I_HAVE_CATEGORY_POSITIONS[category]  # Use I_HAVE_CATEGORY_POSITIONS here
+            logger.debug("Clicking %s category at (%d, %d)", category, category_pos["x"], category_pos["y"])
+            pyautogui.moveTo(category_pos["x"], category_pos["y"])
+            time.sleep(0.1)  # Delay before click
+            pyautogui.click()
+            time.sleep(0.1)  # Delay after click
+
+        # Click the item position
+        for click in sequence:
+            logger.debug("Clicking item at (%d, %d)", click["x"], click["y"])
+            pyautogui.moveTo(click["x"], click["y"])
+            time.sleep(0.1)  # Delay before click
+            pyautogui.click()
+            time.sleep(0.1)  # Delay after click
+
+    # Player method for each sequence type
+    SEQUENCE_PLAYERS = {
+        "amount": play_amount,
+        "market": play_market,
+        "trade": play_trade,
+        "select": play_select,
+    }
 
 def test_category_position(category: str, is_want: bool = True):
     """Test clicking a category position"""
+    import pyautogui
     positions = I_WANT_CATEGORY_POSITIONS if is_want else I_HAVE_CATEGORY_POSITIONS
     if category not in positions:
         print(f"Category {category} not found!")
@@ -523,6 +878,13 @@ def test_category_position(category: str, is_want: bool = True):
     pyautogui.click()
     return True
 
+def print_market_text(captures: List[Tuple[Path, "Image.Image"]]):
+    """Print the OCR text of the (screenshot path, image) market captures taken during a test run"""
+    texts = ocr_batch([screenshot for _, screenshot in captures])
+    for (screenshot_path, _), text in zip(captures, texts):
+        print(f"\nMarket text from {screenshot_path.name}:")
+        print(text)
+
 def test_all_sequences(recorder: ClickRecorder):
     """Test all recorded sequences"""
     if not recorder.sequences:
@@ -542,26 +904,24 @@ def test_all_sequences(recorder: ClickRecorder):
         print("Switch to POE window...")
         time.sleep(0.5)
         
+        captures = []
         for item_name, sequences in sorted(recorder.sequences.items()):
             print(f"\nTesting {item_name}...")
             for seq_type in sequences:
                 print(f"Playing {seq_type} sequence...")
+                recorder.last_capture = None
                 recorder.play_sequence(item_name, seq_type)
+                if recorder.last_capture is not None:
+                    captures.append((recorder.last_screenshot, recorder.last_capture))
                 time.sleep(0.1)
                 
+        print_market_text(captures)
+                
     elif choice == "2":
-        categories = set()
-        # Collect all categories
-        for item_name in recorder.sequences:
-            if item_name.startswith("i_want_") or item_name.startswith("i_have_"):
-                clean_name = item_name[7:]  # Remove i_want_ or i_have_
-                category = get_category_for_item(clean_name)
-                categories.add(category)
+        category_sequences = recorder.sequences_by_category()
+        categories = {category for _, category in category_sequences}
         
-        print("\nAvailable categories:")
-        for category in CATEGORY_ORDER:
-            if category in categories:
-                print(f"- {category}")
+        print("\nAvailable categories:\n" + "\n".join(f"- {category}" for category in CATEGORY_ORDER if category in categories))
             
         category = input("\nEnter category to test: ")
         side = input("Which side to test (want/have/both)? ").lower()
@@ -571,23 +931,17 @@ def test_all_sequences(recorder: ClickRecorder):
         
         # Test i_want sequences for category
         if side in ["want", "both"]:
-            for item_name in sorted(recorder.sequences):
-                if item_name.startswith("i_want_"):
-                    clean_name = item_name[7:]
-                    if get_category_for_item(clean_name) == category:
-                        print(f"\nTesting {item_name}...")
-                        recorder.play_sequence(item_name, "select")
-                        time.sleep(0.1)
+            for item_name in category_sequences.get((True, category), []):
+                print(f"\nTesting {item_name}...")
+                recorder.play_sequence(item_name, "select")
+                time.sleep(0.1)
                         
         # Test i_have sequences for category
         if side in ["have", "both"]:
-            for item_name in sorted(recorder.sequences):
-                if item_name.startswith("i_have_"):
-                    clean_name = item_name[7:]
-                    if get_category_for_item(clean_name) == category:
-                        print(f"\nTesting {item_name}...")
-                        recorder.play_sequence(item_name, "select")
-                        time.sleep(0.1)
+            for item_name in category_sequences.get((False, category), []):
+                print(f"\nTesting {item_name}...")
+                recorder.play_sequence(item_name, "select")
+                time.sleep(0.1)
                         
     elif choice == "3":
         print("\nAvailable items:")
@@ -599,23 +953,26 @@ def test_all_sequences(recorder: ClickRecorder):
             print("\nSwitch to POE window...")
             time.sleep(0.5)
             
+            captures = []
             for seq_type in recorder.sequences[item_name]:
                 print(f"\nPlaying {seq_type} sequence...")
+                recorder.last_capture = None
                 recorder.play_sequence(item_name, seq_type)
+                if recorder.last_capture is not None:
+                    captures.append((recorder.last_screenshot, recorder.last_capture))
                 time.sleep(0.1)
+                
+            print_market_text(captures)
         else:
             print("Item not found!")
             
     elif choice == "4":
         # Load all items from tradeables.json
-        tradeable_file = Path("data/tradeables.json")
-        if not tradeable_file.exists():
+        data = read_tradeables_file()
+        if not data:
             print("tradeables.json not found!")
             return
             
-        with open(tradeable_file) as f:
-            data = json.load(f)
-            
         # Show available categories from tradeables.json
         print("\nAvailable categories:")
         for category in data.keys():
@@ -634,66 +991,55 @@ def test_all_sequences(recorder: ClickRecorder):
         print("\nSwitch to POE window...")
         time.sleep(0.5)
         
-        # Get all items in the category
-        items = []
-        category_data = data[category]
-        if isinstance(category_data, list):
-            items.extend(category_data)
-        elif isinstance(category_data, dict):
-            for subcategory in category_data.values():
-                if isinstance(subcategory, list):
-                    items.extend(subcategory)
-                    
         # Test each item
-        for item in sorted(items):
-            if side in ["want", "both"]:
-                sequence_name = f"i_want_{item}"
-                if sequence_name in recorder.sequences:
-                    print(f"\nTesting {sequence_name}...")
-                    recorder.play_sequence(sequence_name, "select")
-                    time.sleep(0.1)
-                    
-            if side in ["have", "both"]:
-                sequence_name = f"i_have_{item}"
-                if sequence_name in recorder.sequences:
+        sides = SIDE_CHOICES[side]
+        # Only items with recorded sequences, intersected against the index keys
+        recorded_items = recorder.item_index.keys() & load_category_items()[category]
+        for item in sorted(recorded_items):
+            item_sequences = recorder.item_index[item]
+            for is_want in sides:
+                sequence_name = item_sequences.get(is_want)
+                if sequence_name is not None:
                     print(f"\nTesting {sequence_name}...")
                     recorder.play_sequence(sequence_name, "select")
                     time.sleep(0.1)
 
 def find_position():
     """Tool to help find cursor positions"""
+    import pyautogui
     print("\nPosition Finder")
     print("==============")
     print("This tool will help you find cursor positions.")
     print("Instructions:")
     print("1. Switch to POE window")
     print("2. Move your cursor to the position you want to check")
-    print("3. Switch back here and press Enter to see coordinates")
+    print("3. Press Enter to see coordinates (no need to switch back here)")
     print("4. Press 'q' to quit\n")
     
-    while True:
-        command = input("Press Enter to get position, 'q' to quit: ")
-        if command.lower() == 'q':
-            break
-            
-        pos = pyautogui.position()
-        print(f"Current position: ({pos.x}, {pos.y})")
+    try:
+        while True:
+            print("Press Enter to get position, 'q' to quit")
+            pos = wait_for_position()
+            if pos is None:
+                break
+                
+            print(f"Current position: ({pos.x}, {pos.y})")
+    except pyautogui.FailSafeException:
+        print("\nFailSafe triggered - stopped position finder")
 
 def rerecord_tradeables(recorder: ClickRecorder):
     """Re-record positions for existing tradeables"""
+    import pyautogui
     if not recorder.sequences:
         print("No sequences recorded yet!")
         return
 
     # Load tradeables.json to get category structure
-    tradeable_file = Path("data/tradeables.json")
-    if not tradeable_file.exists():
+    data = read_tradeables_file()
+    if not data:
         print("tradeables.json not found!")
         return
         
-    with open(tradeable_file) as f:
-        data = json.load(f)
-        
     # Show available categories
     print("\nAvailable categories:")
     for category in data.keys():
@@ -705,25 +1051,11 @@ def rerecord_tradeables(recorder: ClickRecorder):
         return
         
     # Get items to re-record
-    items_to_record = []
+    # Both are cached and already sorted, so repeated menu runs do not re-sort
     if category == "all":
-        # Get all items from all categories
-        for cat_data in data.values():
-            if isinstance(cat_data, list):
-                items_to_record.extend(cat_data)
-            elif isinstance(cat_data, dict):
-                for subcategory in cat_data.values():
-                    if isinstance(subcategory, list):
-                        items_to_record.extend(subcategory)
+        items_to_record = load_all_category_items()
     else:
-        # Get items from specific category
-        category_data = data[category]
-        if isinstance(category_data, list):
-            items_to_record.extend(category_data)
-        elif isinstance(category_data, dict):
-            for subcategory in category_data.values():
-                if isinstance(subcategory, list):
-                    items_to_record.extend(subcategory)
+        items_to_record = load_category_items()[category]
                     
     if not items_to_record:
         print("No items found to re-record!")
@@ -743,38 +1075,42 @@ def rerecord_tradeables(recorder: ClickRecorder):
     print("\nSwitch to POE window...")
     time.sleep(0.5)
     
-    for item in sorted(items_to_record):
-        print(f"\n=== Re-recording position for {item} ===")
-        print("Position your mouse over the item and press Enter")
-        print("Press 'q' to skip this item")
+    # Sequences are written once at the end instead of rewriting the whole
+    # file after every item, even if recording is aborted midway
+    updated = 0
+    try:
+        for item in items_to_record:
+            print(f"\n=== Re-recording position for {item} ===")
+            print("Position your mouse over the item and press Enter")
+            print("Press 'q' to skip this item")
         
-        try:
-            while True:
-                command = input()
-                
-                if command.lower() == 'q':
-                    print("Skipping item...")
-                    break
+            try:
+                while True:
+                    pos = wait_for_position()
+                    if pos is None:
+                        print("Skipping item...")
+                        break
                     
-                pos = pyautogui.position()
-                item_click = {"x": pos.x, "y": pos.y}
-                print(f"Recorded position at ({pos.x}, {pos.y})")
+                    item_click = {"x": pos.x, "y": pos.y}
+                    print(f"Recorded position at ({pos.x}, {pos.y})")
                 
-                # Update both i_want and i_have sequences
-                recorder.sequences[f"i_want_{item}"] = {"select": [item_click]}
-                recorder.sequences[f"i_have_{item}"] = {"select": [item_click]}
-                recorder.save_sequences()
+                    # Update both i_want and i_have sequences
+                    recorder.set_item_position(item, item_click)
+                    updated += 1
                 
-                print(f"Updated sequences for both i_want_{item} and i_have_{item}")
-                break
+                    print(f"Updated sequences for both i_want_{item} and i_have_{item}")
+                    break
                 
-        except pyautogui.FailSafeException:
-            print("\nRecording aborted (mouse moved to corner)")
-            break
+            except pyautogui.FailSafeException:
+                print("\nRecording aborted (mouse moved to corner)")
+                break
         
-        print("\nContinue with next item? (y/n)")
-        if input().lower() != 'y':
-            break
+            print("\nContinue with next item? (y/n)")
+            if not confirm():
+                break
+    finally:
+        if updated:
+            recorder.save_sequences()
             
     print("\nRe-recording complete!")
 
@@ -792,46 +1128,36 @@ def delete_sequences(recorder: ClickRecorder):
     choice = input("\nChoice (1-3): ")
     
     if choice == "1":
-        confirm = input("Are you sure you want to delete ALL sequences? (y/n): ")
-        if confirm.lower() == 'y':
+        if confirm("Are you sure you want to delete ALL sequences? (y/n): "):
             recorder.delete_all_sequences()
             
     elif choice == "2":
-        categories = set()
-        # Collect all categories
-        for item_name in recorder.sequences:
-            if item_name.startswith("i_want_") or item_name.startswith("i_have_"):
-                clean_name = item_name[7:]  # Remove i_want_ or i_have_
-                category = get_category_for_item(clean_name)
-                categories.add(category)
+        category_sequences = recorder.sequences_by_category()
+        categories = {category for _, category in category_sequences}
         
-        print("\nAvailable categories:")
-        for category in CATEGORY_ORDER:
-            if category in categories:
-                print(f"- {category}")
+        print("\nAvailable categories:\n" + "\n".join(f"- {category}" for category in CATEGORY_ORDER if category in categories))
             
         category = input("\nEnter category to delete: ")
+        if category not in categories:
+            print("Category not found!")
+            return
         side = input("Which side to delete (want/have/both)? ").lower()
+        sides = SIDE_CHOICES.get(side)
+        if sides is None:
+            print("Invalid side!")
+            return
         
-        confirm = input(f"Are you sure you want to delete all {side} sequences for category {category}? (y/n): ")
-        if confirm.lower() == 'y':
-            items_to_delete = []
-            if side in ["want", "both"]:
-                for item_name in recorder.sequences:
-                    if item_name.startswith("i_want_"):
-                        clean_name = item_name[7:]
-                        if get_category_for_item(clean_name) == category:
-                            items_to_delete.append(item_name)
-                            
-            if side in ["have", "both"]:
-                for item_name in recorder.sequences:
-                    if item_name.startswith("i_have_"):
-                        clean_name = item_name[7:]
-                        if get_category_for_item(clean_name) == category:
-                            items_to_delete.append(item_name)
+        if confirm(f"Are you sure you want to delete all {side} sequences for category {category}? (y/n): "):
+            items_to_delete = [
+                item_name
+                for is_want in sides
+                for item_name in category_sequences.get((is_want, category), [])
+            ]
             
             for item_name in items_to_delete:
-                recorder.delete_sequence(item_name)
+                recorder.delete_sequence(item_name, save=False)
+            if items_to_delete:
+                recorder.save_sequences()
             print(f"Deleted {len(items_to_delete)} sequences")
                         
     elif choice == "3":
@@ -852,134 +1178,150 @@ def delete_sequences(recorder: ClickRecorder):
                 type_idx = int(type_choice) - 1
                 if 0 <= type_idx < len(sequence_types):
                     sequence_type = sequence_types[type_idx]
-                    confirm = input(f"Delete {sequence_type} sequence for {item_name}? (y/n): ")
-                    if confirm.lower() == 'y':
+                    if confirm(f"Delete {sequence_type} sequence for {item_name}? (y/n): "):
                         recorder.delete_sequence(item_name, sequence_type)
                 elif type_idx == len(sequence_types):
-                    confirm = input(f"Delete ALL sequences for {item_name}? (y/n): ")
-                    if confirm.lower() == 'y':
+                    if confirm(f"Delete ALL sequences for {item_name}? (y/n): "):
                         recorder.delete_sequence(item_name)
             except ValueError:
                 print("Invalid choice!")
         else:
             print("Item not found!")
 
-def main():
+def record_new_sequence(recorder: ClickRecorder):
+    """Record a sequence of any type for an item"""
+    item_name = input("Item name (e.g., divine_orb, soul_core_azcapa): ")
+
+    print("\nSequence Types:\n" + SEQUENCE_TYPES_MENU)
+    sequence_type = input("\nSequence type (default: select): ") or "select"
+
+    print("\nSwitch to POE window...")
+    time.sleep(0.5)  # Give time to switch windows
+    recorder.record_sequence(item_name, sequence_type)
+
+def play_recorded_sequence(recorder: ClickRecorder):
+    """Play back a recorded sequence"""
+    if not recorder.sequences:
+        print("No sequences recorded yet!")
+        return
+
+    # Render the listing first and write it in one print
+    listing = "".join(
+        f"\n\n{item}:" + "".join(f"\n- {seq_type}: {SEQUENCE_TYPES[seq_type]}" for seq_type in types)
+        for item, types in recorder.sequences.items()
+    )
+    print("\nAvailable sequences:" + listing)
+
+    item_name = input("\nItem name: ")
+    sequence_type = input("Sequence type (default: select): ") or "select"
+    print("\nSwitch to POE window...")
+    time.sleep(0.5)  # Give time to switch windows
+    recorder.play_sequence(item_name, sequence_type)
+
+def record_all_tradeables(recorder: ClickRecorder, autosave_every: int = 0):
+    """Record one position per tradeable, saved every autosave_every items (0: only at the end)"""
+    import pyautogui
+    tradeables = load_clean_tradeables()
+    if not tradeables:
+        print("No tradeables found!")
+        return
+
+    print(f"\nFound {len(tradeables)} tradeable items")
+    print("This will help you record sequences for all items")
+    print("For each item:")
+    print("1. Record the item position once")
+    print("2. It will be used for both i_want and i_have sequences")
+    print("(The tab and category positions are added automatically)")
+
+    # Sequences are saved once at the end (or every autosave_every
+    # items) instead of rewriting the whole file after every item
+    unsaved = 0
+    try:
+        for _, clean_name in tradeables:
+            # Record item position once
+            print(f"\n=== Recording position for {clean_name} ===")
+            print("Position your mouse over the item and press Enter")
+            print("Press 'q' when done")
+
+            # Record the position
+            try:
+                while True:
+                    pos = wait_for_position()
+                    if pos is None:
+                        break
+
+                    item_click = {"x": pos.x, "y": pos.y}
+                    print(f"Recorded position at ({pos.x}, {pos.y})")
+
+                    # Store the item click as both the i_want and i_have sequence
+                    recorder.set_item_position(clean_name, item_click)
+                    unsaved += 1
+                    if autosave_every and unsaved >= autosave_every:
+                        recorder.save_sequences()
+                        unsaved = 0
+
+                    print(f"Recorded sequences for both i_want_{clean_name} and i_have_{clean_name}")
+                    break
+
+            except pyautogui.FailSafeException:
+                print("\nRecording aborted (mouse moved to corner)")
+                break
+
+            print("\nContinue with next item? (y/n)")
+            if not confirm():
+                break
+    finally:
+        if unsaved:
+            recorder.save_sequences()
+
+MENU_TEXT = """
+Click Sequence Recorder
+=====================
+1. Record New Sequence
+2. Play Sequence
+3. Record All Tradeables
+4. Find Position
+5. Test All Sequences
+6. Re-record Tradeables
+7. Delete Sequences
+8. Exit"""
+
+# Handler for each menu choice, "8" exits
+MENU_HANDLERS = {
+    "1": record_new_sequence,
+    "2": play_recorded_sequence,
+    "3": record_all_tradeables,
+    "4": lambda recorder: find_position(),
+    "5": test_all_sequences,
+    "6": rerecord_tradeables,
+    "7": delete_sequences,
+}
+
+def main(autosave_every: int = 0, save_screenshots: bool = False):
+    """Interactive recorder menu, test runs OCR market captures in memory unless save_screenshots is set"""
     recorder = ClickRecorder()
+    recorder.save_screenshots = save_screenshots
+    handlers = {**MENU_HANDLERS, "3": partial(record_all_tradeables, autosave_every=autosave_every)}
     
     while True:
-        print("\nClick Sequence Recorder")
-        print("=====================")
-        print("1. Record New Sequence")
-        print("2. Play Sequence")
-        print("3. Record All Tradeables")
-        print("4. Find Position")
-        print("5. Test All Sequences")
-        print("6. Re-record Tradeables")
-        print("7. Delete Sequences")
-        print("8. Exit")
-        
+        print(MENU_TEXT)
         choice = input("\nChoice: ")
-        
-        if choice == "1":
-            item_name = input("Item name (e.g., divine_orb, soul_core_azcapa): ")
-            
-            print("\nSequence Types:")
-            for seq_type, desc in SEQUENCE_TYPES.items():
-                print(f"- {seq_type}: {desc}")
-            sequence_type = input("\nSequence type (default: select): ") or "select"
-            
-            print("\nSwitch to POE window...")
-            time.sleep(0.5)  # Give time to switch windows
-            recorder.record_sequence(item_name, sequence_type)
-            
-        elif choice == "2":
-            if not recorder.sequences:
-                print("No sequences recorded yet!")
-                continue
-                
-            print("\nAvailable sequences:")
-            for item, types in recorder.sequences.items():
-                print(f"\n{item}:")
-                for seq_type in types:
-                    print(f"- {seq_type}: {SEQUENCE_TYPES[seq_type]}")
-            
-            item_name = input("\nItem name: ")
-            sequence_type = input("Sequence type (default: select): ") or "select"
-            print("\nSwitch to POE window...")
-            time.sleep(0.5)  # Give time to switch windows
-            recorder.play_sequence(item_name, sequence_type)
-            
-        elif choice == "3":  # Record all tradeables
-            tradeables = load_tradeables()
-            if not tradeables:
-                print("No tradeables found!")
-                continue
-                
-            print(f"\nFound {len(tradeables)} tradeable items")
-            print("This will help you record sequences for all items")
-            print("For each item:")
-            print("1. Record the item position once")
-            print("2. It will be used for both i_want and i_have sequences")
-            print("(The tab and category positions are added automatically)")
-            
-            for item in sorted(tradeables):
-                # Clean the item name for use as identifier
-                clean_name = item.lower().replace(" ", "_").replace("'", "")
-                
-                # Record item position once
-                print(f"\n=== Recording position for {clean_name} ===")
-                print("Position your mouse over the item and press Enter")
-                print("Press 'q' when done")
-                
-                # Record the position
-                try:
-                    while True:
-                        command = input()
-                        
-                        if command.lower() == 'q':
-                            break
-                            
-                        pos = pyautogui.position()
-                        item_click = {"x": pos.x, "y": pos.y}
-                        print(f"Recorded position at ({pos.x}, {pos.y})")
-                        
-                        # Create i_want sequence
-                        i_want_clicks = [item_click]  # Just the item click
-                        
-                        # Create i_have sequence
-                        i_have_clicks = [item_click]  # Just the item click
-                        
-                        # Save both sequences
-                        recorder.sequences[f"i_want_{clean_name}"] = {"select": i_want_clicks}
-                        recorder.sequences[f"i_have_{clean_name}"] = {"select": i_have_clicks}
-                        recorder.save_sequences()
-                        
-                        print(f"Saved sequences for both i_want_{clean_name} and i_have_{clean_name}")
-                        break
-                        
-                except pyautogui.FailSafeException:
-                    print("\nRecording aborted (mouse moved to corner)")
-                    break
-                
-                print("\nContinue with next item? (y/n)")
-                if input().lower() != 'y':
-                    break
-                
-        elif choice == "4":
-            find_position()
-            
-        elif choice == "5":
-            test_all_sequences(recorder)
-            
-        elif choice == "6":
-            rerecord_tradeables(recorder)
-            
-        elif choice == "7":
-            delete_sequences(recorder)
-            
-        elif choice == "8":
+        if choice == "8":
             break
+            
+        handler = handlers.get(choice)
+        if handler is not None:
+            handler(recorder)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Record and test click sequences")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Show every click while playing sequences")
+    parser.add_argument("--autosave-every", type=int, default=0,
+                        help="Save every N items while recording all tradeables (default: only at the end)")
+    parser.add_argument("--save-screenshots", action="store_true",
+                        help="Also write test run market captures to data/market_screenshots for debugging")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    main(autosave_every=args.autosave_every, save_screenshots=args.save_screenshots)
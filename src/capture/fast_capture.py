@@ -1,4 +1,5 @@
 import pyautogui
+import mss
 import numpy as np
 from typing import Dict, Tuple, Optional, List
 import json
@@ -12,6 +13,13 @@ class FastCapture:
         self.elements: Dict[str, Dict] = {}
         self.validation_size = 3  # Size of validation region (3x3 pixels)
         self.color_threshold = 20  # Default color difference threshold
+        self.sct = mss.mss()  # Reused screen grabber, avoids capture setup per validation
+        
+        # Element positions and colors as arrays for vectorized batch validation,
+        # element_rows maps an element name to its row
+        self.element_rows: Dict[str, int] = {}
+        self.positions = np.empty((0, 2), dtype=np.int32)
+        self.colors = np.empty((0, 3), dtype=np.int16)  # Signed so differences cannot wrap
         
     def calibrate_element(self, name: str, description: str) -> bool:
         """Calibrate an element with click position and pixel color validation"""
@@ -23,42 +31,64 @@ class FastCapture:
         
         # Get click position and validation color
         pos = pyautogui.position()
-        half_size = self.validation_size // 2
-        region = (pos[0]-half_size, pos[1]-half_size, self.validation_size, self.validation_size)
-        screenshot = pyautogui.screenshot(region=region)
-        pixel_colors = np.array(screenshot)
-        center_color = pixel_colors[half_size, half_size].tolist()
+        center_color = self.pixel_color(pos)
         
         # Save element data
-        self.elements[name] = {
-            'click_pos': pos,
-            'validation_color': center_color,
-            'last_valid': time.time()
-        }
+        self.add_element(name, tuple(pos), center_color)
         
         print(f"✓ Saved element '{name}'")
         print(f"  Click position: {pos}")
         print(f"  Validation color: {center_color}")
         return True
     
+    def add_element(self, name: str, pos: Tuple[int, int], color: Tuple[int, int, int]):
+        """Store an element and its row in the position and color arrays"""
+        self.elements[name] = {
+            'click_pos': pos,
+            'validation_color': color,
+            'last_valid': time.time()
+        }
+        row = self.element_rows.get(name)
+        if row is None:
+            row = len(self.element_rows)
+            if row == len(self.positions):  # Grow the arrays by doubling
+                extra = max(8, row)
+                self.positions = np.concatenate([self.positions, np.zeros((extra, 2), dtype=np.int32)])
+                self.colors = np.concatenate([self.colors, np.zeros((extra, 3), dtype=np.int16)])
+            self.element_rows[name] = row
+        self.positions[row] = pos
+        self.colors[row] = color
+        
+    def pixel_color(self, pos: Tuple[int, int]) -> Tuple[int, int, int]:
+        """Get the RGB color at the center of the validation region around pos"""
+        half_size = self.validation_size // 2
+        raw = self.sct.grab({
+            "left": pos[0] - half_size,
+            "top": pos[1] - half_size,
+            "width": self.validation_size,
+            "height": self.validation_size
+        })
+        # Read the center pixel straight from the BGRA buffer
+        offset = ((raw.height // 2) * raw.width + raw.width // 2) * 4
+        b, g, r = raw.raw[offset:offset + 3]
+        return r, g, b
+    
     def validate_element(self, name: str, threshold: Optional[int] = None) -> bool:
         """Validate element exists by checking pixel color"""
         if name not in self.elements:
             return False
             
         element = self.elements[name]
+        return self.matches_color(element, self.pixel_color(element['click_pos']), threshold)
+    
+    def matches_color(self, element: Dict, color: Tuple[int, int, int], threshold: Optional[int] = None) -> bool:
+        """Check a sampled color against the element's validation color"""
         threshold = threshold or self.color_threshold
-        pos = element['click_pos']
-        expected_color = np.array(element['validation_color'])
-        
-        # Get current color
-        half_size = self.validation_size // 2
-        region = (pos[0]-half_size, pos[1]-half_size, self.validation_size, self.validation_size)
-        screenshot = pyautogui.screenshot(region=region)
-        current_color = np.array(screenshot)[half_size, half_size]
+        expected_r, expected_g, expected_b = element['validation_color']
+        r, g, b = color
         
         # Check color difference
-        color_diff = np.abs(expected_color - current_color).max()
+        color_diff = max(abs(expected_r - r), abs(expected_g - g), abs(expected_b - b))
         is_valid = color_diff <= threshold
         
         if is_valid:
@@ -66,6 +96,37 @@ class FastCapture:
             
         return is_valid
     
+    def validate_many(self, names: List[str], threshold: Optional[int] = None) -> Dict[str, bool]:
+        """Validate several elements from a single full-screen grab"""
+        results = dict.fromkeys(names, False)
+        known = [name for name in names if name in self.element_rows]
+        if not known:
+            return results
+            
+        monitor = self.sct.monitors[0]  # Bounding box of all monitors
+        raw = self.sct.grab(monitor)
+        screen = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+        
+        # Map the element positions into the buffer, which can be in physical
+        # pixels (e.g. 2x on Retina displays)
+        rows = np.fromiter((self.element_rows[name] for name in known), dtype=np.intp, count=len(known))
+        positions = self.positions[rows]
+        px = ((positions[:, 0] - monitor["left"]) * (raw.width / monitor["width"])).astype(np.intp)
+        py = ((positions[:, 1] - monitor["top"]) * (raw.height / monitor["height"])).astype(np.intp)
+        inside = (px >= 0) & (px < raw.width) & (py >= 0) & (py < raw.height)
+        
+        # Gather all pixels at once, BGRA -> RGB, and compare against the colors
+        pixels = screen[py.clip(0, raw.height - 1), px.clip(0, raw.width - 1), 2::-1].astype(np.int16)
+        color_diff = np.abs(pixels - self.colors[rows]).max(axis=1)
+        valid = inside & (color_diff <= (threshold or self.color_threshold))
+        
+        now = time.time()
+        for name, is_valid in zip(known, valid.tolist()):
+            results[name] = is_valid
+            if is_valid:
+                self.elements[name]['last_valid'] = now
+        return results
+    
     def click(self, name: str, validate: bool = True) -> bool:
         """Click element with optional validation"""
         if name not in self.elements:
@@ -80,9 +141,13 @@ class FastCapture:
         return True
     
     def batch_click(self, names: list, validate: bool = True):
-        """Click multiple elements in sequence"""
+        """Click multiple elements in sequence, validating them all up front"""
+        valid = self.validate_many(names) if validate else {}
         for name in names:
-            self.click(name, validate)
+            if validate and not valid[name]:
+                print(f"Warning: Element '{name}' validation failed")
+                continue
+            self.click(name, validate=False)
             
     def save_calibration(self, filename: str = 'calibration.json'):
         """Save calibrated elements to file"""
@@ -103,11 +168,7 @@ class FastCapture:
                 data = json.load(f)
                 
             for name, element in data.items():
-                self.elements[name] = {
-                    'click_pos': tuple(element['click_pos']),
-                    'validation_color': element['validation_color'],
-                    'last_valid': time.time()
-                }
+                self.add_element(name, tuple(element['click_pos']), tuple(element['validation_color']))
                 
             return True
         except Exception as e:
@@ -1,5 +1,9 @@
+import hashlib
+import sys
 import pyautogui
+import pyperclip
 import cv2
+import mss
 import numpy as np
 import pytesseract
 from dataclasses import dataclass
@@ -7,6 +11,14 @@ from typing import Dict, Tuple, List, Optional
 import time
 import keyboard
 
+def capture_digest(gray: np.ndarray) -> bytes:
+    """Digest of a grayscale capture, equal for equal pixels however the array was produced"""
+    gray = np.ascontiguousarray(gray)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(gray.shape, dtype=np.int64).tobytes())
+    digest.update(gray.tobytes())
+    return digest.digest()
+
 @dataclass
 class CaptureElement:
     """A screen element with position and optional capture region"""
@@ -16,6 +28,7 @@ class CaptureElement:
     validation_color: Optional[np.ndarray] = None  # Color to validate against
     last_capture: Optional[np.ndarray] = None  # Cache last capture
     last_text: Optional[str] = None  # Cache last text
+    last_digest: Optional[bytes] = None  # Digest of the capture last_text was read from
 
 class ScreenCapture:
     def __init__(self):
@@ -28,10 +41,24 @@ class ScreenCapture:
         self.fast_mode = True  # Always use fast mode for trading
         self.cache_enabled = True  # When True, caches captures
         self.batch_size = 10  # Number of actions to batch together
+        self.ocr_page_seg_mode = 7  # Calibrated regions hold a single line of text
+        self.ocr_config = f'--psm {self.ocr_page_seg_mode}'
+        try:
+            # Optional in-process Tesseract, avoids starting a tesseract process per read
+            from tesserocr import PyTessBaseAPI
+            self.ocr_api = PyTessBaseAPI(psm=self.ocr_page_seg_mode)
+        except ImportError:
+            self.ocr_api = None
+        self.sct = mss.mss()  # Reused screen grabber for batch captures and snapshots
         
         # Default region size around click point
         self.default_region_size = (100, 30)  # width, height
         
+    def grab_screen(self) -> np.ndarray:
+        """Grab the primary screen as a BGR array ready for OpenCV drawing"""
+        # mss gives BGRA, so dropping alpha leaves BGR without a color conversion
+        return np.asarray(self.sct.grab(self.sct.monitors[1]))[:, :, :3].copy()
+        
     def calibrate_element(self, name: str, description: str) -> bool:
         """Calibrate both click position and capture region in one step"""
         print(f"\nCalibrating element: {description}")
@@ -53,27 +80,29 @@ class ScreenCapture:
         region = (x, y, width, height)
         
         # Take a screenshot for preview
-        screen = pyautogui.screenshot()
-        screen = np.array(screen)
-        screen = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
+        screen = self.grab_screen()
         
         # Store validation color
         validation_color = None
         
+        # Redraw only after a key changed something, and block until the next key
+        redraw = True
         while True:
-            preview = screen.copy()
-            # Draw click position
-            cv2.circle(preview, click_pos, 5, (0, 255, 0), -1)
-            # Draw region
-            cv2.rectangle(preview, (x, y), (x+width, y+height), (0, 0, 255), 2)
-            
-            # Draw validation color if picked
-            if validation_color is not None:
-                cv2.circle(preview, (x+10, y+10), 10, validation_color.tolist(), -1)
-            
-            # Show preview
-            cv2.imshow('Preview - ↑↓←→:adjust size, C:pick color, Enter:save, ESC:cancel', preview)
-            key = cv2.waitKey(100)
+            if redraw:
+                preview = screen.copy()
+                # Draw click position
+                cv2.circle(preview, click_pos, 5, (0, 255, 0), -1)
+                # Draw region
+                cv2.rectangle(preview, (x, y), (x+width, y+height), (0, 0, 255), 2)
+                
+                # Draw validation color if picked
+                if validation_color is not None:
+                    cv2.circle(preview, (x+10, y+10), 10, validation_color.tolist(), -1)
+                
+                # Show preview
+                cv2.imshow('Preview - ↑↓←→:adjust size, C:pick color, Enter:save, ESC:cancel', preview)
+                redraw = False
+            key = cv2.waitKey(0)
             
             # Handle key presses
             if key == 27:  # ESC
@@ -96,11 +125,14 @@ class ScreenCapture:
                 width -= 2
             elif key == 83:  # Right arrow
                 width += 2
+            else:
+                continue
                 
             # Update region
             x = click_pos[0] - width//2
             y = click_pos[1] - height//2
             region = (x, y, width, height)
+            redraw = True
         
         # Cleanup
         cv2.destroyAllWindows()
@@ -160,24 +192,23 @@ class ScreenCapture:
         return True
         
     def click(self, name: str, fast: bool = False):
-        """Click a calibrated position"""
+        """Click a calibrated position
+        
+        click(x, y) moves and clicks in one call with a single pyautogui.PAUSE,
+        so fast is kept only for compatibility.
+        """
         if name not in self.elements:
             print(f"Element '{name}' not calibrated!")
             return False
             
-        if fast or self.fast_mode:
-            pyautogui.moveTo(*self.elements[name].click_pos)
-            pyautogui.click()
-        else:
-            pyautogui.click(*self.elements[name].click_pos)
+        pyautogui.click(*self.elements[name].click_pos)
         return True
         
     def batch_click(self, names: List[str]):
         """Click multiple positions in rapid succession"""
         for name in names:
             if name in self.elements:
-                pyautogui.moveTo(*self.elements[name].click_pos)
-                pyautogui.click()
+                pyautogui.click(*self.elements[name].click_pos)
                 if not self.fast_mode:
                     time.sleep(0.05)
                     
@@ -191,6 +222,17 @@ class ScreenCapture:
         if enter:
             pyautogui.press('enter')
             
+    def paste_text(self, text: str, enter: bool = True):
+        """Enter text through the clipboard in one paste, for fields like amounts
+        
+        Use type_text for fields that do not accept pasting.
+        """
+        pyperclip.copy(text)
+        pyautogui.hotkey('command' if sys.platform == 'darwin' else 'ctrl', 'v')
+        
+        if enter:
+            pyautogui.press('enter')
+            
     def capture_text(self, name: str, force_refresh: bool = False) -> str:
         """Capture and read text from a calibrated region"""
         if name not in self.elements or not self.elements[name].capture_region:
@@ -210,33 +252,80 @@ class ScreenCapture:
             
             # Convert to grayscale
             image = np.array(screenshot)
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(gray, cv2.COLOR_BGR2GRAY)
-            
-            # Cache the capture
-            if self.cache_enabled:
-                element.last_capture = gray
+            gray = cv2.cvtColor(np.ascontiguousarray(image), cv2.COLOR_RGB2GRAY)
             
-            # Use OCR to read text
-            text = pytesseract.image_to_string(gray)
-            text = text.strip()
-            
-            # Cache the text
-            if self.cache_enabled:
-                element.last_text = text
-                
-            return text
+            return self.read_text(element, gray)
             
         except Exception as e:
             print(f"Error capturing text: {str(e)}")
             return ""
             
+    def read_text(self, element: CaptureElement, gray: np.ndarray) -> str:
+        """OCR a grayscale capture of an element, caching the capture and text
+        
+        A capture identical to the one last_text was read from skips OCR.
+        """
+        digest = capture_digest(gray)
+        if self.cache_enabled and element.last_text is not None and element.last_digest == digest:
+            return element.last_text
+            
+        # Cache the capture
+        if self.cache_enabled:
+            element.last_capture = gray
+        
+        # Use OCR to read text
+        if self.ocr_api is not None:
+            from PIL import Image
+            self.ocr_api.SetImage(Image.fromarray(gray))
+            text = self.ocr_api.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(gray, config=self.ocr_config)
+        text = text.strip()
+        
+        # Cache the text
+        if self.cache_enabled:
+            element.last_text = text
+            element.last_digest = digest
+            
+        return text
+            
     def batch_capture(self, names: List[str]) -> Dict[str, str]:
-        """Capture text from multiple regions quickly"""
+        """Capture text from multiple regions with a single screen grab"""
         results = {}
+        pending = []
         for name in names:
-            if name in self.elements and self.elements[name].capture_region:
-                results[name] = self.capture_text(name)
+            element = self.elements.get(name)
+            if element is None or not element.capture_region:
+                continue
+            if self.cache_enabled and element.last_text is not None:
+                results[name] = element.last_text
+            else:
+                pending.append(element)
+        if not pending:
+            return results
+            
+        try:
+            # Grab all monitors once, mss returns BGRA in physical pixels
+            monitor = self.sct.monitors[0]
+            full = np.asarray(self.sct.grab(monitor))
+            scale_x = full.shape[1] / monitor["width"]
+            scale_y = full.shape[0] / monitor["height"]
+        except Exception as e:
+            print(f"Error capturing text: {str(e)}")
+            return results
+            
+        for element in pending:
+            try:
+                # Slice the region out of the shared grab, dropping alpha
+                x, y, w, h = element.capture_region
+                left = int((x - monitor["left"]) * scale_x)
+                top = int((y - monitor["top"]) * scale_y)
+                region = full[top:top + int(h * scale_y), left:left + int(w * scale_x), :3]
+                gray = cv2.cvtColor(np.ascontiguousarray(region), cv2.COLOR_BGR2GRAY)
+                results[element.name] = self.read_text(element, gray)
+            except Exception as e:
+                print(f"Error capturing text: {str(e)}")
+                results[element.name] = ""
         return results
         
     def clear_cache(self, name: Optional[str] = None):
@@ -245,16 +334,16 @@ class ScreenCapture:
             if name in self.elements:
                 self.elements[name].last_capture = None
                 self.elements[name].last_text = None
+                self.elements[name].last_digest = None
         else:
             for element in self.elements.values():
                 element.last_capture = None
                 element.last_text = None
+                element.last_digest = None
                 
     def save_debug_image(self, name: str = 'debug'):
         """Save a debug image showing all calibrated elements"""
-        screen = pyautogui.screenshot()
-        screen = np.array(screen)
-        screen = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
+        screen = self.grab_screen()
         
         # Draw all elements
         for element in self.elements.values():
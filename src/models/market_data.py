@@ -1,11 +1,44 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any
 
-@dataclass
+@lru_cache(maxsize=4096)
+def parse_ratio(ratio_str: str) -> float:
+    """Parse a ratio string into a float value, memoized since ratios repeat across scans"""
+    try:
+        # Handle "x:y" format
+        if ':' in ratio_str:
+            num, denom = ratio_str.split(':')
+            # Remove any non-numeric characters
+            num = ''.join(c for c in num if c.isdigit() or c == '.')
+            denom = ''.join(c for c in denom if c.isdigit() or c == '.')
+            if not num or not denom:
+                return 0.0
+            return float(num) / float(denom)
+        
+        # Handle "<x:y" or ">x:y" format
+        if ratio_str.startswith(('<', '>')):
+            base_ratio = ratio_str[1:].strip()
+            return parse_ratio(base_ratio)
+        
+        # If just a number, return it
+        if ratio_str.replace('.', '').isdigit():
+            return float(ratio_str)
+        
+        return 0.0
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+@dataclass(slots=True, frozen=True)
 class Trade:
     ratio: str
     stock: int
 
+    @property
+    def ratio_value(self) -> float:
+        """Parsed ratio, 0.0 if invalid (memoized by parse_ratio, and not serialized)"""
+        return parse_ratio(self.ratio)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert Trade to dictionary"""
         return {
@@ -13,7 +46,7 @@ class Trade:
             "stock": self.stock
         }
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MarketData:
     i_want: str
     i_have: str
@@ -21,6 +54,11 @@ class MarketData:
     available_trades: List[Trade]
     competing_trades: List[Trade]
 
+    @property
+    def market_ratio_value(self) -> float:
+        """Parsed market_ratio (memoized by parse_ratio, and not serialized)"""
+        return parse_ratio(self.market_ratio)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert MarketData to dictionary"""
         return {
@@ -38,6 +76,7 @@ class MarketData:
             i_want=data['i_want'],
             i_have=data['i_have'],
             market_ratio=data['market_ratio'],
-            available_trades=[Trade(**t) for t in data['available_trades']],
-            competing_trades=[Trade(**t) for t in data['competing_trades']]
+            # Only the stored fields, so records carrying extra keys still load
+            available_trades=[Trade(t['ratio'], t['stock']) for t in data['available_trades']],
+            competing_trades=[Trade(t['ratio'], t['stock']) for t in data['competing_trades']]
         ) 
\ No newline at end of file
@@ -1,11 +1,21 @@
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set, FrozenSet
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import json
+import orjson
+import math
 from pathlib import Path
 import numpy as np
-from collections import defaultdict
-from ..models.market_data import MarketData, Trade
+import networkx as nx
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from ..models.market_data import MarketData, Trade, parse_ratio
+
+SHORTEST_CYCLE_LENGTH = 4  # Deepest shortest-cycle search without an explicit max_cycle_length
+
+@lru_cache(maxsize=4096)
+def read_market_data(json_path: str, mtime_ns: int, size: int) -> MarketData:
+    """Read a market data file; mtime_ns and size are only part of the cache key"""
+    return MarketData.from_dict(orjson.loads(Path(json_path).read_bytes()))
 
 @dataclass
 class TradingOpportunity:
@@ -29,19 +39,15 @@ class TradingOpportunity:
         }
 
 @dataclass
-class TriangleOpportunity:
-    step1: Tuple[str, str, str]  # (from_currency, to_currency, ratio)
-    step2: Tuple[str, str, str]
-    step3: Tuple[str, str, str]
+class CycleOpportunity:
+    steps: List[Tuple[str, str, str]]  # (from_currency, to_currency, ratio) per leg
     total_profit: float
     min_volume: int
     confidence: float
 
     def to_dict(self):
         return {
-            'step1': list(self.step1),
-            'step2': list(self.step2),
-            'step3': list(self.step3),
+            'steps': [list(step) for step in self.steps],
             'total_profit': self.total_profit,
             'min_volume': self.min_volume,
             'confidence': self.confidence
@@ -74,42 +80,35 @@ class TradingStrategies:
         self.history_window = timedelta(minutes=30)
         self.min_profit_threshold = 0.015  # 1.5% minimum profit
         self.max_trade_volume = 1000
+        self.max_cycle_length: Optional[int] = None  # Enumerate all cycles up to this many legs; None uses Bellman-Ford
+        self.shortest_cycles_only = False  # Stop the cycle search at the shortest length with a profitable cycle
         self.volatility_window = timedelta(minutes=30)
         self.known_currencies: Set[str] = set()
+        self._edges: Dict[Tuple[str, str], Tuple[float, float, float]] = {}  # pair -> (-log(rate), rate, volume)
+        self._dirty_edges: Set[Tuple[str, str]] = set()  # Edges changed since cycles were last computed
+        self._cycle_cache: Optional[List[CycleOpportunity]] = None
+        self._cycle_cache_settings: Optional[Tuple] = None  # strategy_settings() the cycle cache was built with
+        self._enumerated_cycles: List[List[str]] = []  # Johnson's output, reused while the edge set is unchanged
+        self._enumerated_structure: Optional[Tuple[FrozenSet[Tuple[str, str]], int]] = None
+        self._analysis_cache: OrderedDict = OrderedDict()  # market key -> opportunities, cleared on history or settings change
+        self._analysis_cache_settings: Optional[Tuple] = None  # strategy_settings() the analysis cache was built with
+        self.analysis_cache_size = 256
 
-    def parse_ratio(self, ratio_str: str) -> float:
-        """Parse a ratio string into a float value"""
-        try:
-            # Handle "x:y" format
-            if ':' in ratio_str:
-                num, denom = ratio_str.split(':')
-                # Remove any non-numeric characters
-                num = ''.join(c for c in num if c.isdigit() or c == '.')
-                denom = ''.join(c for c in denom if c.isdigit() or c == '.')
-                if not num or not denom:
-                    return 0.0
-                return float(num) / float(denom)
-            
-            # Handle "<x:y" or ">x:y" format
-            if ratio_str.startswith(('<', '>')):
-                base_ratio = ratio_str[1:].strip()
-                return self.parse_ratio(base_ratio)
-            
-            # If just a number, return it
-            if ratio_str.replace('.', '').isdigit():
-                return float(ratio_str)
-            
-            return 0.0
-        except (ValueError, ZeroDivisionError):
-            return 0.0
+    # Shared with the models, which parse their ratios once on construction
+    parse_ratio = staticmethod(parse_ratio)
+
+    def parse_ratios(self, trades: List) -> np.ndarray:
+        """Parse the ratios of Trade objects or trade dicts into a float array"""
+        # Filled straight into a preallocated array, without an intermediate list
+        return np.fromiter(
+            (t.ratio_value if isinstance(t, Trade) else self.parse_ratio(t['ratio']) for t in trades),
+            dtype=np.float64, count=len(trades)
+        )
 
     def load_market_data(self, json_path: Path) -> MarketData:
-        """Load market data from JSON file"""
-        with open(json_path) as f:
-            data = json.load(f)
-            # Convert timestamp from filename
-            timestamp = datetime.strptime(json_path.stem.split('_')[0], '%Y%m%d_%H%M%S')
-            return MarketData(**data, timestamp=timestamp)
+        """Load market data from JSON file (cached until the file changes)"""
+        stat = Path(json_path).stat()
+        return read_market_data(str(json_path), stat.st_mtime_ns, stat.st_size)
 
     def update_market_history(self, pair: Tuple[str, str], data: Dict):
         """Update market history with new data"""
@@ -127,60 +126,112 @@ class TradingStrategies:
                 for t in data['competing_trades']
             ]
         
-        self.market_history[pair] = {
-            'timestamp': now,
-            'data': data
-        }
+        previous = self.market_history.get(pair)
+        history_changed = previous is None or previous['data'] != data
+        
+        if history_changed:
+            available_ratios = self.parse_ratios(data.get('available_trades', []))
+            competing_ratios = self.parse_ratios(data.get('competing_trades', []))
+            self.market_history[pair] = {
+                'timestamp': now,
+                'data': data,
+                # Parsed once here so strategies can work on whole arrays
+                'available_ratios': available_ratios,
+                'competing_ratios': competing_ratios,
+                # Best bid and ask folded in once per update instead of on every analysis
+                'bid': float(available_ratios.min()) if available_ratios.size else 0.0,
+                'ask': float(competing_ratios.max()) if competing_ratios.size else 0.0,
+                'volatility': self.ratio_volatility(available_ratios)
+            }
+            self.update_edge(pair, data)
+        else:
+            # Same data as last time, only keep the entry from expiring
+            previous['timestamp'] = now
         
         # Clean old history
         cutoff = now - self.history_window
-        self.market_history = {
-            k: v for k, v in self.market_history.items()
-            if v['timestamp'] > cutoff
-        }
+        expired = [k for k, v in self.market_history.items() if v['timestamp'] <= cutoff]
+        if expired:
+            history_changed = True
+        for k in expired:
+            del self.market_history[k]
+            if self._edges.pop(k, None) is not None:
+                self._dirty_edges.add(k)
         
         # Update known currencies
         self.known_currencies.add(pair[0])
         self.known_currencies.add(pair[1])
-
-    def calculate_volatility(self, currency_pair: Tuple[str, str]) -> float:
-        """Calculate price volatility for a currency pair"""
-        if currency_pair not in self.market_history:
-            return 0.0
         
+        # Cached analyses depend on history, drop them once it changes
+        if history_changed:
+            self._analysis_cache.clear()
+
+    def update_edge(self, pair: Tuple[str, str], data: Dict):
+        """Refresh the cached graph edge for a pair, marking it dirty only on a real change"""
+        rate = volume = None
         try:
-            ratios = [self.parse_ratio(entry['ratio']) for entry in self.market_history[currency_pair]['data']['available_trades']]
-            if not ratios:
-                return 0.0
+            trades = data.get('available_trades')
+            if trades:
+                # Use first trade for rate and volume
+                first_trade = trades[0]
+                rate = self.parse_ratio(first_trade['ratio'])
+                volume = float(first_trade['stock'])
+        except (KeyError, IndexError, ValueError, TypeError):
+            rate = None
             
-            # Filter out invalid ratios
-            ratios = [r for r in ratios if r > 0]
-            if not ratios:
-                return 0.0
+        previous = self._edges.get(pair)
+        if rate is None or rate <= 0:  # Skip missing or invalid rates
+            if previous is not None:
+                del self._edges[pair]
+                self._dirty_edges.add(pair)
+            return
             
-            return np.std(ratios) / np.mean(ratios)
-        except (KeyError, ValueError, ZeroDivisionError):
+        if previous is not None and math.isclose(previous[1], rate) and previous[2] == volume:
+            return  # Same rate and volume, cached weight is still valid
+            
+        # The log is only taken when the rate actually changed
+        self._edges[pair] = (-math.log(rate), rate, volume)
+        self._dirty_edges.add(pair)
+
+    def calculate_volatility(self, currency_pair: Tuple[str, str]) -> float:
+        """Price volatility for a currency pair, computed when its history was updated"""
+        history = self.market_history.get(currency_pair)
+        return history['volatility'] if history else 0.0
+
+    @staticmethod
+    def ratio_volatility(ratios: np.ndarray) -> float:
+        """Coefficient of variation of the valid ratios"""
+        # Filter out invalid ratios
+        ratios = ratios[ratios > 0]
+        if not ratios.size:
             return 0.0
+        
+        return float(np.std(ratios) / np.mean(ratios))
 
     def find_integer_ratio_opportunities(self, market_data: MarketData) -> Optional[TradingOpportunity]:
         """Find opportunities where ratios are clean integers"""
         try:
-            # Check available trades
-            for trade in market_data.available_trades:
-                ratio = self.parse_ratio(trade.ratio)
-                if ratio > 0:  # Valid ratio
-                    # Check if either numerator or denominator is an integer
-                    if ratio.is_integer() or (1/ratio).is_integer():
-                        # Found potential integer ratio trade
-                        return TradingOpportunity(
-                            buy_currency=market_data.i_want,
-                            sell_currency=market_data.i_have,
-                            buy_ratio=trade.ratio,
-                            sell_ratio=market_data.market_ratio,
-                            potential_profit=0.05,  # 5% estimated profit
-                            trade_volume=min(100, trade.stock),  # Conservative volume
-                            confidence=0.8
-                        )
+            # Check all available trades at once
+            ratios = self.parse_ratios(market_data.available_trades)
+            valid = ratios > 0  # Valid ratios
+            with np.errstate(divide='ignore'):
+                inverse = 1 / ratios
+            
+            # Check if either numerator or denominator is an integer
+            integral = valid & ((ratios == np.floor(ratios)) | (inverse == np.floor(inverse)))
+            hits = np.flatnonzero(integral)
+            if hits.size:
+                # Found potential integer ratio trade
+                trade = market_data.available_trades[hits[0]]
+                return TradingOpportunity(
+                    buy_currency=market_data.i_want,
+                    sell_currency=market_data.i_have,
+                    buy_ratio=trade.ratio,
+                    sell_ratio=market_data.market_ratio,
+                    potential_profit=0.05,  # 5% estimated profit
+                    trade_volume=min(100, trade.stock),  # Conservative volume
+                    confidence=0.8
+                )
         except (ValueError, ZeroDivisionError):
             pass
         
@@ -197,8 +248,8 @@ class TradingStrategies:
             best_competing = market_data.competing_trades[0]
             
             # Convert ratios to floats for comparison
-            avail_ratio = self.parse_ratio(best_available.ratio)
-            comp_ratio = self.parse_ratio(best_competing.ratio)
+            avail_ratio = best_available.ratio_value
+            comp_ratio = best_competing.ratio_value
             
             if avail_ratio > 0 and comp_ratio > 0:  # Only consider valid ratios
                 # Calculate spread
@@ -219,68 +270,192 @@ class TradingStrategies:
             
         return None
 
-    def find_triangle_arbitrage(self, market_data: MarketData) -> List[TriangleOpportunity]:
-        """Strategy 3: Find triangle arbitrage opportunities across currency pairs
+    def build_rate_graph(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Build the currency graph from the cached edges
+        
+        Edge (i, j) carries -log(rate) of the best available trade for that pair,
+        so a cycle with negative total weight is a profitable trade loop.
+        Returns the currencies, edge weights, raw rates and volumes.
+        """
+        currencies = sorted(self.known_currencies)
+        index = {currency: i for i, currency in enumerate(currencies)}
+        weights = np.full((len(currencies), len(currencies)), np.inf)
+        rates = np.zeros((len(currencies), len(currencies)))
+        volumes = np.zeros((len(currencies), len(currencies)))
+        
+        for (base, quote), (weight, rate, volume) in self._edges.items():
+            i, j = index[base], index[quote]
+            weights[i, j] = weight
+            rates[i, j] = rate
+            volumes[i, j] = volume
+                
+        return currencies, weights, rates, volumes
+
+    def find_negative_cycles(self, weights: np.ndarray) -> List[List[int]]:
+        """Find distinct negative cycles with a vectorized Bellman-Ford pass
+        
+        Every node starts at distance 0 (a virtual source linked to all nodes),
+        so cycles anywhere in the graph are detected in a single run.
+        """
+        n = len(weights)
+        dist = np.zeros(n)
+        pred = np.full(n, -1)
+        updated = np.zeros(n, dtype=bool)
+        columns = np.arange(n)
+        
+        for _ in range(n):
+            candidates = dist[:, None] + weights  # candidates[i, j] = dist[i] + w(i, j)
+            best_pred = np.argmin(candidates, axis=0)
+            best = candidates[best_pred, columns]
+            updated = best < dist - 1e-12
+            if not updated.any():
+                return []  # Converged, no negative cycle
+            dist = np.where(updated, best, dist)
+            pred = np.where(updated, best_pred, pred)
+            
+        # Nodes still relaxing after n passes sit on or behind a negative cycle
+        cycles = []
+        seen = set()
+        for node in np.flatnonzero(updated):
+            # Walk back n steps to make sure we are inside the cycle
+            v = node
+            for _ in range(n):
+                v = pred[v]
+                if v < 0:
+                    break
+            if v < 0:
+                continue
+                
+            cycle = [v]
+            u = pred[v]
+            while u != v and u >= 0 and len(cycle) <= n:
+                cycle.append(u)
+                u = pred[u]
+            if u != v:
+                continue
+            cycle.reverse()
+            
+            # Rotate so the smallest index leads, to dedupe the same loop
+            start = cycle.index(min(cycle))
+            key = tuple(cycle[start:] + cycle[:start])
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            total_weight = sum(weights[a, b] for a, b in zip(key, key[1:] + key[:1]))
+            if total_weight < 0:
+                cycles.append(list(key))
+                
+        return cycles
+
+    def enumerate_profitable_cycles(self, currencies: List[str]) -> List[List[int]]:
+        """Enumerate every elementary cycle up to max_cycle_length legs and keep the profitable ones
+        
+        Cycles come from Johnson's algorithm and are only re-enumerated when an
+        edge enters or leaves the graph; rate changes just re-score them.
+        """
+        structure = (frozenset(self._edges), self.max_cycle_length)
+        if structure != self._enumerated_structure:
+            graph = nx.DiGraph()
+            graph.add_edges_from(self._edges)
+            self._enumerated_cycles = list(nx.simple_cycles(graph, length_bound=self.max_cycle_length))
+            self._enumerated_structure = structure
+            
+        index = {currency: i for i, currency in enumerate(currencies)}
+        profitable = []
+        for cycle in self._enumerated_cycles:
+            legs = zip(cycle, cycle[1:] + cycle[:1])
+            if math.fsum(self._edges[leg][0] for leg in legs) < 0:
+                profitable.append([index[currency] for currency in cycle])
+                
+        return profitable
+
+    def find_shortest_profitable_cycles(self, currencies: List[str]) -> List[List[int]]:
+        """Find the profitable cycles with the fewest legs by iterative deepening
+        
+        Cycles of exactly 2, 3, ... legs are searched depth-first, stopping at the
+        first length with a profitable cycle or at max_cycle_length (default
+        SHORTEST_CYCLE_LENGTH), since the number of paths grows roughly tenfold
+        per extra leg. Each cycle is only walked from its smallest index.
+        """
+        index = {currency: i for i, currency in enumerate(currencies)}
+        neighbours: Dict[int, List[Tuple[int, float]]] = {}
+        closing: Dict[Tuple[int, int], float] = {}
+        for (base, quote), (weight, _, _) in self._edges.items():
+            neighbours.setdefault(index[base], []).append((index[quote], weight))
+            closing[index[base], index[quote]] = weight
+            
+        max_length = min(self.max_cycle_length or SHORTEST_CYCLE_LENGTH, len(currencies))
+        found: List[List[int]] = []
+        
+        def search(length: int, path: List[int], weight: float):
+            if len(path) == length:
+                back = closing.get((path[-1], path[0]))
+                if back is not None and weight + back < 0:
+                    found.append(list(path))
+                return
+            for nxt, leg_weight in neighbours.get(path[-1], ()):
+                if nxt > path[0] and nxt not in path:
+                    path.append(nxt)
+                    search(length, path, weight + leg_weight)
+                    path.pop()
+                    
+        for length in range(2, max_length + 1):
+            for start in range(len(currencies)):
+                search(length, [start], 0.0)
+            if found:
+                break
+        return found
+
+    def find_cycle_arbitrage(self, market_data: MarketData) -> List[CycleOpportunity]:
+        """Strategy 3: Find arbitrage cycles of any length across currency pairs
         Example: divine -> exalt -> chaos -> divine
         """
+        # Only rerun the search when an edge or a setting actually changed
+        settings = self.strategy_settings()
+        if (self._cycle_cache is not None and not self._dirty_edges
+                and self._cycle_cache_settings == settings):
+            return self._cycle_cache
+        self._dirty_edges.clear()
+        self._cycle_cache_settings = settings
+            
         opportunities = []
         
-        # Need at least 3 currencies for triangle arbitrage
-        if len(self.known_currencies) < 3:
+        # Need at least 2 currencies for a trade loop
+        if len(self.known_currencies) < 2:
+            self._cycle_cache = opportunities
             return opportunities
             
-        # Try all possible currency triangles
-        for c1 in self.known_currencies:
-            for c2 in self.known_currencies:
-                if c2 == c1:
-                    continue
-                for c3 in self.known_currencies:
-                    if c3 in (c1, c2):
-                        continue
-                        
-                    # Get best rates for each pair
-                    pairs = [(c1, c2), (c2, c3), (c3, c1)]
-                    rates = []
-                    volumes = []
-                    
-                    for base, quote in pairs:
-                        key = (base, quote)  # Use tuple directly as key
-                        if key not in self.market_history:
-                            continue
-                            
-                        # Get latest rate and volume
-                        latest = self.market_history[key]['data']
-                        if not latest['available_trades']:
-                            continue
-                            
-                        # Use first trade for rate and volume
-                        first_trade = latest['available_trades'][0]
-                        rate = self.parse_ratio(first_trade['ratio'])
-                        if rate <= 0:  # Skip invalid rates
-                            continue
-                            
-                        rates.append(rate)
-                        volumes.append(first_trade['stock'])
-                    
-                    if len(rates) != 3:
-                        continue
-                    
-                    # Calculate total profit
-                    total_rate = rates[0] * rates[1] * rates[2]
-                    profit = total_rate - 1.0
-                    
-                    if profit > self.min_profit_threshold:
-                        min_vol = min(volumes)
-                        opportunities.append(TriangleOpportunity(
-                            step1=(c1, c2, f"{rates[0]}:1"),
-                            step2=(c2, c3, f"{rates[1]}:1"),
-                            step3=(c3, c1, f"{rates[2]}:1"),
-                            total_profit=profit,
-                            min_volume=min(min_vol, self.max_trade_volume),
-                            confidence=min(profit * 3, 1.0)
-                        ))
+        currencies, weights, rates, volumes = self.build_rate_graph()
         
-        return sorted(opportunities, key=lambda x: x.total_profit, reverse=True)
+        if self.shortest_cycles_only:
+            cycles = self.find_shortest_profitable_cycles(currencies)
+        elif self.max_cycle_length:
+            cycles = self.enumerate_profitable_cycles(currencies)
+        else:
+            cycles = self.find_negative_cycles(weights)
+        
+        for cycle in cycles:
+            legs = list(zip(cycle, cycle[1:] + cycle[:1]))
+            leg_rates = [float(rates[a, b]) for a, b in legs]
+            
+            # Total profit from the summed -log weights, no per-cycle product of rates
+            profit = math.expm1(-math.fsum(float(weights[a, b]) for a, b in legs))
+            
+            if profit > self.min_profit_threshold:
+                min_vol = int(min(volumes[a, b] for a, b in legs))
+                opportunities.append(CycleOpportunity(
+                    steps=[
+                        (currencies[a], currencies[b], f"{rate}:1")
+                        for (a, b), rate in zip(legs, leg_rates)
+                    ],
+                    total_profit=profit,
+                    min_volume=min(min_vol, self.max_trade_volume),
+                    confidence=min(profit * 3, 1.0)
+                ))
+        
+        self._cycle_cache = sorted(opportunities, key=lambda x: x.total_profit, reverse=True)
+        return self._cycle_cache
 
     def find_market_making_opportunities(self, market_data: MarketData) -> List[MarketMakingOpportunity]:
         """Strategy 4: Find market making opportunities based on spread and volume
@@ -297,18 +472,11 @@ class TradingStrategies:
                 
                 # Calculate metrics
                 latest = history['data']['available_trades'][0]  # Use first trade instead of last
-                current_ratio = self.parse_ratio(latest['ratio'])
-                
-                # Get bid-ask spread
-                available_prices = [self.parse_ratio(t['ratio']) for t in history['data']['available_trades']]
-                competing_prices = [self.parse_ratio(t['ratio']) for t in history['data']['competing_trades']]
-                
-                if not available_prices or not competing_prices:
-                    continue
                 
-                bid = min(available_prices)
-                ask = max(competing_prices)
-                if bid <= 0 or ask <= 0:  # Skip invalid prices
+                # Get bid-ask spread from the prices computed on update
+                bid = history['bid']
+                ask = history['ask']
+                if bid <= 0 or ask <= 0:  # Skip missing or invalid prices
                     continue
                 
                 spread = (ask - bid) / bid
@@ -338,11 +506,50 @@ class TradingStrategies:
         
         return sorted(opportunities, key=lambda x: x.confidence, reverse=True)
 
+    def strategy_settings(self) -> Tuple:
+        """Tunable settings the strategy results depend on, compared to invalidate caches"""
+        return (self.min_profit_threshold, self.max_trade_volume, self.max_cycle_length, self.shortest_cycles_only)
+
+    @staticmethod
+    def market_key(market_data: MarketData) -> Tuple:
+        """Hashable snapshot of the market data fields the strategies read"""
+        return (
+            market_data.i_want,
+            market_data.i_have,
+            market_data.market_ratio,
+            tuple((t.ratio, t.stock) for t in market_data.available_trades),
+            tuple((t.ratio, t.stock) for t in market_data.competing_trades)
+        )
+
     def analyze_market(self, market_data: MarketData) -> Dict[str, List]:
-        """Analyze market data with all strategies"""
+        """Analyze market data with all strategies
+        
+        Results are memoized on the market contents until market history or
+        the strategy settings change, so evaluating and then executing the
+        same scan analyzes once.
+        """
+        settings = self.strategy_settings()
+        if self._analysis_cache_settings != settings:
+            self._analysis_cache.clear()
+            self._analysis_cache_settings = settings
+            
+        key = self.market_key(market_data)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return cached
+            
+        opportunities = self.run_strategies(market_data)
+        self._analysis_cache[key] = opportunities
+        if len(self._analysis_cache) > self.analysis_cache_size:
+            self._analysis_cache.popitem(last=False)
+        return opportunities
+
+    def run_strategies(self, market_data: MarketData) -> Dict[str, List]:
+        """Run every strategy against the market data, bypassing the cache"""
         opportunities = {
             'basic': [],
-            'triangle': [],
+            'cycle': [],
             'market_making': []
         }
         
@@ -356,9 +563,9 @@ class TradingStrategies:
             opportunities['basic'].append(('Spread', spread_opp))
             
         # Advanced strategies
-        triangle_opps = self.find_triangle_arbitrage(market_data)
-        if triangle_opps:
-            opportunities['triangle'] = triangle_opps
+        cycle_opps = self.find_cycle_arbitrage(market_data)
+        if cycle_opps:
+            opportunities['cycle'] = cycle_opps
             
         making_opps = self.find_market_making_opportunities(market_data)
         if making_opps:
@@ -373,38 +580,27 @@ class TradingStrategies:
         if not market_data.available_trades or not market_data.competing_trades:
             return opportunities
         
-        # Get best available trade (lowest ratio for buying)
-        best_available = None
-        best_available_ratio = float('inf')
-        
-        for trade in market_data.available_trades:
-            ratio = self.parse_ratio(trade['ratio'])
-            if ratio > 0 and ratio < best_available_ratio:
-                best_available = trade
-                best_available_ratio = ratio
-            
-        # Get best competing trade (highest ratio for selling)
-        best_competing = None
-        best_competing_ratio = 0
-        
-        for trade in market_data.competing_trades:
-            ratio = self.parse_ratio(trade['ratio'])
-            if ratio > best_competing_ratio:
-                best_competing = trade
-                best_competing_ratio = ratio
-            
-        if not best_available or not best_competing:
+        # Best available trade is the lowest valid ratio (buying), best competing the highest (selling)
+        available = self.parse_ratios(market_data.available_trades)
+        competing = self.parse_ratios(market_data.competing_trades)
+        valid = available > 0
+        if not valid.any() or not (competing > 0).any():
             return opportunities
         
+        best_index = int(np.argmin(np.where(valid, available, np.inf)))
+        best_available = market_data.available_trades[best_index]
+        best_available_ratio = float(available[best_index])
+        best_competing_ratio = float(competing.max())
+        
         # Calculate potential arbitrage
         if best_competing_ratio > best_available_ratio:
             profit_ratio = (best_competing_ratio - best_available_ratio) / best_available_ratio
             
             # Cap trade volume at 100 for safety
-            volume = min(int(best_available['stock']), 100) if isinstance(best_available['stock'], (int, float)) else 100
+            stock = best_available.stock if isinstance(best_available, Trade) else best_available['stock']
+            volume = min(int(stock), 100) if isinstance(stock, (int, float)) else 100
             
             opportunity = TradingOpportunity(
-                strategy_name="Basic Arbitrage",
                 buy_currency=market_data.i_want,
                 sell_currency=market_data.i_have,
                 buy_ratio=str(best_available_ratio),
@@ -461,14 +657,13 @@ def main():
             print(f"Recommended Volume: {opp.trade_volume}")
             print(f"Confidence: {opp.confidence*100:.2f}%")
     
-    if opportunities['triangle']:
-        print("\nTriangle Arbitrage Opportunities:")
+    if opportunities['cycle']:
+        print("\nCycle Arbitrage Opportunities:")
         print("=" * 50)
-        for i, opp in enumerate(opportunities['triangle'], 1):
+        for i, opp in enumerate(opportunities['cycle'], 1):
             print(f"\nOpportunity {i}:")
-            print(f"Step 1: Trade {opp.step1[0]} -> {opp.step1[1]} at {opp.step1[2]}")
-            print(f"Step 2: Trade {opp.step2[0]} -> {opp.step2[1]} at {opp.step2[2]}")
-            print(f"Step 3: Trade {opp.step3[0]} -> {opp.step3[1]} at {opp.step3[2]}")
+            for step_num, (from_currency, to_currency, ratio) in enumerate(opp.steps, 1):
+                print(f"Step {step_num}: Trade {from_currency} -> {to_currency} at {ratio}")
             print(f"Total Profit: {opp.total_profit*100:.2f}%")
             print(f"Safe Volume: {opp.min_volume}")
             print(f"Confidence: {opp.confidence*100:.2f}%")
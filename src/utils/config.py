@@ -1,14 +1,17 @@
 """Configuration for the trading bot"""
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Set, Dict, List
+from typing import Dict, List, FrozenSet, Tuple
 
-def load_tradeables() -> Set[str]:
-    """Load all tradeable items from tradeables.json"""
+@lru_cache(maxsize=1)
+def load_tradeables() -> FrozenSet[str]:
+    """Load all tradeable items from tradeables.json (cached after the first read)"""
     tradeable_file = Path("data/tradeables.json")
     if not tradeable_file.exists():
         print("Warning: tradeables.json not found")
-        return set()
+        return frozenset()
         
     with open(tradeable_file) as f:
         data = json.load(f)
@@ -27,7 +30,17 @@ def load_tradeables() -> Set[str]:
     for category, items in data.items():
         process_items(items)
     
-    return tradeables
+    return frozenset(tradeables)
+
+def load_trade_list(trade_list_path: str) -> Tuple[str, ...]:
+    """Load the unique, sorted items of a trade list file (cached until the file changes)"""
+    return read_trade_list(trade_list_path, os.path.getmtime(trade_list_path))
+
+@lru_cache(maxsize=8)
+def read_trade_list(trade_list_path: str, mtime: float) -> Tuple[str, ...]:
+    """Read a trade list file; mtime is only part of the cache key"""
+    with open(trade_list_path) as f:
+        return tuple(sorted({line.strip() for line in f if line.strip()}))
 
 # Load all tradeable items
 TRADEABLE_ITEMS = load_tradeables()
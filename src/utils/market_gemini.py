@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 from pathlib import Path
 import google.generativeai as genai
 from PIL import Image
@@ -92,7 +92,7 @@ def analyze_market_image(image_path: Path) -> Optional[MarketData]:
             json_str = json_str.rsplit('}', 1)[0] + '}'
             
         # Parse JSON
-        data = json.loads(json_str)
+        data = orjson.loads(json_str)
         
         # Convert to MarketData object
         market_data = MarketData.from_dict(data)
@@ -113,8 +113,7 @@ def save_market_data(data: Dict[str, Any], image_path: Path):
     json_path = data_dir / f"{base_name}.json"
     
     # Save data
-    with open(json_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    json_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"Market data saved to: {json_path}")
     return json_path
@@ -124,6 +123,15 @@ def analyze_latest_market():
     try:
         # Get latest screenshot
         image_path = get_latest_screenshot()
+    except Exception as e:
+        print(f"Error analyzing market: {e}")
+        return None
+        
+    return analyze_market_screenshot(image_path)
+
+def analyze_market_screenshot(image_path: Path) -> Optional[MarketData]:
+    """Analyze a specific market screenshot and save results"""
+    try:
         print(f"Analyzing screenshot: {image_path}")
         
         # Analyze image
@@ -137,7 +145,7 @@ def analyze_latest_market():
         
         # Print results
         print("\nMarket Analysis Results:")
-        print(json.dumps(market_data.to_dict(), indent=2))
+        print(orjson.dumps(market_data.to_dict(), option=orjson.OPT_INDENT_2).decode())
         
         return market_data
         
@@ -0,0 +1,83 @@
+"""Tests for the bot's pair selection"""
+from itertools import permutations
+
+from src.bot import TradingBot
+
+
+def make_bot(currencies=(), batch_size=1):
+    """A bot with only the pair selection state, skipping the UI recorder"""
+    bot = TradingBot.__new__(TradingBot)
+    bot.fixed_pair = None
+    bot.trade_currencies = tuple(currencies)
+    bot.trade_list = range(len(currencies) * (len(currencies) - 1)) or None
+    bot.current_trade_list_index = 0
+    bot.scan_batch_size = batch_size
+    bot.pair_backoff = 5.0
+    bot.max_fail_streak = 8
+    bot.pair_stats = {}
+    bot.rescan_pairs = []
+    return bot
+
+
+def test_trade_list_decodes_pairs_in_permutation_order():
+    currencies = ('a', 'b', 'c', 'd')
+    bot = make_bot(currencies)
+
+    pairs = [bot.draw_pair() for _ in range(len(bot.trade_list))]
+
+    assert pairs == list(permutations(currencies, 2))
+    assert bot.draw_pair() == ('a', 'b')
+
+
+def test_batch_draws_each_pair_once():
+    bot = make_bot(('a', 'b'), batch_size=4)
+
+    assert bot.next_batch() == [('a', 'b'), ('b', 'a')]
+
+
+def test_batch_starts_with_pairs_to_rescan():
+    bot = make_bot(('a', 'b', 'c'), batch_size=3)
+    bot.rescan_pairs = [('c', 'b'), ('a', 'b')]
+
+    assert bot.next_batch() == [('c', 'b'), ('a', 'b'), ('a', 'c')]
+    assert bot.rescan_pairs == []
+
+
+def test_found_opportunity_clears_pair_backoff():
+    bot = make_bot(('a', 'b', 'c'))
+    bot.record_pair_outcome(('a', 'b'), False)
+    assert bot.pair_backing_off(('a', 'b'))
+
+    bot.record_pair_outcome(('a', 'b'), True)
+
+    assert bot.pair_stats == {}
+    assert not bot.pair_backing_off(('a', 'b'))
+
+
+def test_new_trade_list_drops_stats_of_untraded_pairs(tmp_path):
+    bot = make_bot(('a', 'b', 'c'))
+    bot.record_pair_outcome(('a', 'b'), False)
+    bot.record_pair_outcome(('a', 'c'), False)
+    trade_list = tmp_path / "trade_list.txt"
+    trade_list.write_text("# kept currencies\na\nb\n", encoding='utf-8')
+
+    bot.set_trade_list(str(trade_list))
+
+    assert set(bot.pair_stats) == {('a', 'b')}
+
+
+def test_scan_order_drops_reverse_duplicates():
+    bot = make_bot()
+
+    ordered = bot.order_scan_pairs([('b', 'a'), ('a', 'b'), ('a', 'c'), ('c', 'b')])
+
+    assert ordered == [('a', 'b'), ('a', 'c'), ('c', 'b')]
+
+
+def test_scan_order_keeps_i_have_selected_across_groups():
+    bot = make_bot()
+
+    ordered = bot.order_scan_pairs([('a', 'd'), ('c', 'b'), ('c', 'd')])
+
+    # The c group starts on d, which is still selected after (a, d)
+    assert ordered == [('a', 'd'), ('c', 'd'), ('c', 'b')]
@@ -0,0 +1,49 @@
+"""Tests for the command line helpers"""
+from itertools import combinations
+
+from main import configure_strategies, count_pairs, pick_pairs, setup_argparse
+from src.trade.strategies import TradingStrategies
+
+
+def test_max_cycle_length_flag_configures_strategies():
+    args = setup_argparse().parse_args(['analyze', '--max-cycle-length', '4'])
+
+    strategies = configure_strategies(TradingStrategies(), args)
+
+    assert strategies.max_cycle_length == 4
+
+
+def test_cycle_search_defaults_to_bellman_ford():
+    args = setup_argparse().parse_args(['analyze'])
+
+    assert configure_strategies(TradingStrategies(), args).max_cycle_length is None
+
+
+def test_shortest_cycles_flag_configures_strategies():
+    args = setup_argparse().parse_args(['test', '--shortest-cycles'])
+
+    assert configure_strategies(TradingStrategies(), args).shortest_cycles_only
+
+
+def test_count_pairs_matches_combinations():
+    assert [count_pairs(n) for n in range(5)] == [len(list(combinations(range(n), 2))) for n in range(5)]
+
+
+def test_pick_pairs_yields_sorted_picks_in_one_pass():
+    pairs = list(combinations('abcde', 2))
+
+    picked = pick_pairs(iter(pairs), [0, 3, 9])
+
+    assert list(picked) == [pairs[0], pairs[3], pairs[9]]
+
+
+def test_pick_pairs_stops_after_last_pick():
+    consumed = []
+
+    def pairs():
+        for pair in combinations('abcde', 2):
+            consumed.append(pair)
+            yield pair
+
+    assert len(list(pick_pairs(pairs(), [1, 2]))) == 2
+    assert len(consumed) == 4
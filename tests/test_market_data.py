@@ -0,0 +1,41 @@
+"""Tests for the market data model"""
+import orjson
+import pytest
+
+from src.models.market_data import MarketData, Trade, parse_ratio
+
+
+@pytest.mark.parametrize("ratio, expected", [
+    ("3:2", 1.5),
+    ("1.5:3", 0.5),
+    ("<10:4", 2.5),
+    ("> 1:8", 0.125),
+    ("7", 7.0),
+    ("x3:2x", 1.5),
+    ("1:0", 0.0),
+    (":2", 0.0),
+    ("abc", 0.0),
+])
+def test_parse_ratio(ratio, expected):
+    assert parse_ratio(ratio) == expected
+
+
+def test_parsed_ratios_are_not_serialized():
+    market_data = MarketData('a', 'b', '3:2', [Trade('2:1', 5)], [])
+
+    stored = orjson.loads(orjson.dumps(market_data))
+
+    assert stored == market_data.to_dict()
+    assert MarketData.from_dict(stored) == market_data
+    assert market_data.market_ratio_value == 1.5
+    assert market_data.available_trades[0].ratio_value == 2.0
+
+
+def test_records_with_extra_trade_keys_still_load():
+    record = {
+        'i_want': 'a', 'i_have': 'b', 'market_ratio': '3:2',
+        'available_trades': [{'ratio': '2:1', 'stock': 5, 'ratio_value': 2.0}],
+        'competing_trades': []
+    }
+
+    assert MarketData.from_dict(record).available_trades == [Trade('2:1', 5)]
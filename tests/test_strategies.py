@@ -0,0 +1,179 @@
+"""Tests for the trading strategies"""
+import math
+import os
+
+import numpy as np
+import orjson
+import pytest
+
+from src.models.market_data import MarketData, Trade
+from src.trade.strategies import TradingStrategies, read_market_data
+
+
+def add_pair(strategies, i_want, i_have, ratio, stock=100):
+    """Feed one pair's best available trade into the strategies' history"""
+    strategies.update_market_history((i_want, i_have), {
+        'market_ratio': ratio,
+        'available_trades': [{'ratio': ratio, 'stock': stock}],
+        'competing_trades': []
+    })
+
+
+def add_triangle(strategies):
+    """a -> b -> c -> a pays 10% per leg, the a <-> b loop loses money"""
+    add_pair(strategies, 'a', 'b', '11:10')
+    add_pair(strategies, 'b', 'c', '11:10')
+    add_pair(strategies, 'c', 'a', '11:10')
+    add_pair(strategies, 'b', 'a', '1:2')
+
+
+def legs(opportunity):
+    """The (from, to) legs of a cycle, independent of where the cycle starts"""
+    return {(from_currency, to_currency) for from_currency, to_currency, _ in opportunity.steps}
+
+
+def test_parse_ratios_accepts_trades_and_dicts():
+    strategies = TradingStrategies()
+
+    ratios = strategies.parse_ratios([Trade('3:2', 1), {'ratio': '1:4'}, {'ratio': 'bad'}])
+
+    assert ratios.dtype == np.float64
+    assert ratios.tolist() == [1.5, 0.25, 0.0]
+    assert strategies.parse_ratios([]).shape == (0,)
+
+
+def test_market_data_loads_are_cached_until_the_file_changes(tmp_path):
+    strategies = TradingStrategies()
+    json_path = tmp_path / "market.json"
+    market_data = MarketData('a', 'b', '3:2', [Trade('3:2', 5)], [])
+    json_path.write_bytes(orjson.dumps(market_data))
+    read_market_data.cache_clear()
+
+    first = strategies.load_market_data(json_path)
+    assert strategies.load_market_data(json_path) is first
+    assert read_market_data.cache_info().hits == 1
+
+    # Same size, so only the new mtime tells the rewritten file apart
+    json_path.write_bytes(orjson.dumps(MarketData('a', 'b', '4:2', [Trade('3:2', 5)], [])))
+    stat = json_path.stat()
+    os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert first == market_data
+    assert strategies.load_market_data(json_path).market_ratio == '4:2'
+
+
+def test_bellman_ford_finds_profitable_triangle():
+    strategies = TradingStrategies()
+    add_triangle(strategies)
+
+    cycles = strategies.find_cycle_arbitrage(None)
+
+    assert [legs(cycle) for cycle in cycles] == [{('a', 'b'), ('b', 'c'), ('c', 'a')}]
+    assert cycles[0].total_profit == pytest.approx(1.1 ** 3 - 1)
+
+
+def test_bellman_ford_ignores_losing_loops():
+    strategies = TradingStrategies()
+    add_pair(strategies, 'a', 'b', '2:1')
+    add_pair(strategies, 'b', 'a', '1:3')
+
+    assert strategies.find_cycle_arbitrage(None) == []
+
+
+def test_edges_store_negative_log_rates():
+    strategies = TradingStrategies()
+    add_pair(strategies, 'a', 'b', '3:2')
+
+    currencies, weights, rates, volumes = strategies.build_rate_graph()
+
+    assert currencies == ['a', 'b']
+    assert weights[0, 1] == pytest.approx(-math.log(1.5))
+    assert rates[0, 1] == 1.5
+    assert volumes[0, 1] == 100
+    assert weights[1, 0] == math.inf
+
+
+def test_cycle_profit_keeps_precision_for_thin_margins():
+    strategies = TradingStrategies()
+    strategies.min_profit_threshold = 0
+    add_pair(strategies, 'a', 'b', '1000001:1000000')
+    add_pair(strategies, 'b', 'a', '1:1')
+
+    cycles = strategies.find_cycle_arbitrage(None)
+
+    assert cycles[0].total_profit == pytest.approx(1e-6, rel=1e-9)
+
+
+def test_enumerated_cycles_find_profitable_triangle():
+    strategies = TradingStrategies()
+    strategies.max_cycle_length = 3
+    add_triangle(strategies)
+
+    cycles = strategies.find_cycle_arbitrage(None)
+
+    assert [legs(cycle) for cycle in cycles] == [{('a', 'b'), ('b', 'c'), ('c', 'a')}]
+    assert cycles[0].total_profit == pytest.approx(1.1 ** 3 - 1)
+
+
+def test_enumerated_cycles_respect_max_cycle_length():
+    strategies = TradingStrategies()
+    strategies.max_cycle_length = 2
+    add_triangle(strategies)
+
+    assert strategies.find_cycle_arbitrage(None) == []
+
+
+def test_shortest_cycles_only_keeps_fewest_legs():
+    strategies = TradingStrategies()
+    strategies.shortest_cycles_only = True
+    add_triangle(strategies)
+    # A profitable two-leg loop between c and d makes the triangle too long
+    add_pair(strategies, 'c', 'd', '3:2')
+    add_pair(strategies, 'd', 'c', '3:2')
+
+    cycles = strategies.find_cycle_arbitrage(None)
+
+    assert [legs(cycle) for cycle in cycles] == [{('c', 'd'), ('d', 'c')}]
+    assert cycles[0].total_profit == pytest.approx(1.5 * 1.5 - 1)
+
+
+def test_shortest_cycles_match_enumeration_at_that_length():
+    strategies = TradingStrategies()
+    add_triangle(strategies)
+    currencies, *_ = strategies.build_rate_graph()
+
+    strategies.max_cycle_length = 3
+    enumerated = strategies.enumerate_profitable_cycles(currencies)
+    shortest = strategies.find_shortest_profitable_cycles(currencies)
+
+    assert sorted(map(sorted, shortest)) == sorted(map(sorted, enumerated))
+    assert all(len(cycle) == 3 for cycle in shortest)
+
+
+def test_shortest_cycles_stop_at_the_default_length():
+    strategies = TradingStrategies()
+    strategies.shortest_cycles_only = True
+    # Only a five-leg loop pays, longer than SHORTEST_CYCLE_LENGTH
+    for i_want, i_have in zip('abcde', 'bcdea'):
+        add_pair(strategies, i_want, i_have, '11:10')
+
+    assert strategies.find_cycle_arbitrage(None) == []
+
+    strategies.max_cycle_length = 5
+    cycles = strategies.find_cycle_arbitrage(None)
+
+    assert [len(cycle.steps) for cycle in cycles] == [5]
+
+
+def test_analysis_cache_follows_setting_changes():
+    strategies = TradingStrategies()
+    add_triangle(strategies)
+    market_data = MarketData('a', 'b', '11:10', [Trade('11:10', 100)], [])
+    assert len(strategies.analyze_market(market_data)['cycle']) == 1
+
+    strategies.min_profit_threshold = 0.5
+    assert strategies.analyze_market(market_data)['cycle'] == []
+
+    strategies.min_profit_threshold = 0.015
+    strategies.max_cycle_length = 2
+    assert strategies.analyze_market(market_data)['cycle'] == []